@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks del pipeline de 18-08.
+
+Uso:
+  python benchmarks.py paralelo --mb 300 --workers 1 2 4 8
+  python benchmarks.py paridad
+  python benchmarks.py tokenizador --comentarios 50000
+  python benchmarks.py suite --mb 1 10 100 1024 --salida base.json
+  python benchmarks.py suite --mb 1 10 --comparar base.json --tolerancia 0.15
+
+El corpus es sintético y reproducible (misma semilla => mismo texto): oraciones
+en español con vocabulario de distribución tipo Zipf, tildes, ñ, ¿? y ¡!.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Vocabulario base; el orden fija la frecuencia (Zipf: el primero es el más común)
+PALABRAS = (
+    "de la que el en y a los se del las un por con no una su para es al lo como "
+    "más pero sus le ya o este sí porque esta entre cuando muy sin sobre también "
+    "me hasta hay donde quien desde todo nos durante todos uno les ni contra otros "
+    "gobierno ministerio salud país ciudad año años día semana lunes informe datos "
+    "población región norte sur empresa mercado precio precios calidad servicio "
+    "comida ambiente atención cliente teléfono cámara batería pantalla diseño "
+    "niño niña señor señora mañana español compañía montaña pequeño año sueño "
+    "rápido rápidamente fácil difícil increíble excelente público política "
+    "económico económica educación información tecnología inteligencia artificial "
+    "desarrollo análisis estadística frecuencia palabra texto artículo noticia "
+    "presidente elecciones congreso ley reforma crisis inflación empleo trabajo "
+    "universidad estudiantes escuela hospital médicos vacunación gripe centros"
+).split()
+
+_APERTURA = {"?": "¿", "!": "¡"}
+
+# Textos de referencia para comparar backends de tokenización: los de los
+# propios ejercicios y casos difíciles (tildes, ñ, ¿? ¡! «», guiones, números).
+CORPUS_REFERENCIA = (
+    "El Ministerio de Salud informó este lunes que las vacunaciones contra la gripe aumentaron un 15% durante la última semana. "
+    "Según el reporte oficial, las regiones del norte registraron la mayor demanda, mientras que en el sur se mantiene estable.",
+    "Python es GENIAL. Me encanta Python, porque Python es fácil, útil y potente; "
+    "además, tiene una comunidad enorme. ¿Te gusta programar en Python?",
+    "La inteligencia artificial avanza rápidamente en múltiples áreas. "
+    "Cada día aparecen nuevas aplicaciones que facilitan nuestras tareas.",
+    "¡La comida estuvo increíble! El servicio fue excelente y el ambiente muy acogedor. Definitivamente regresaré.",
+    "Excelente relación calidad-precio. El rendimiento es muy bueno y el diseño elegante.",
+    "El niño soñó con una montaña pequeña; la señora Peña dijo: «mañana será otro año».",
+    "Pedí la pizza margherita y estaba deliciosa. Recomendado 100%. Costó 12,50 euros y tardó 1.000 años...",
+    "¿Qué pasó? ¡No lo sé! Llegó a las 9 p. m. y se fue. jajaja xd #comida @restaurante",
+    "Los pingüinos del zoológico — según la guía — comen 3,5 kg de pescado al día “fresquísimo”.",
+)
+
+# Palabras típicas de comentarios en redes (para el corpus de comentarios cortos)
+_EXTRAS_COMENTARIO = ("jaja", "jajaja", "xd", "wow", "👍", "🔥", "😍", "#delicioso", "@local", "!!!", "...")
+
+
+def _oraciones_sinteticas(rng: random.Random) -> Iterator[str]:
+    """Genera oraciones sintéticas infinitas."""
+    pesos = [1.0 / (i + 1) for i in range(len(PALABRAS))]
+    while True:
+        palabras = rng.choices(PALABRAS, weights=pesos, k=rng.randint(6, 22))
+        palabras[0] = palabras[0].capitalize()
+        if rng.random() < 0.15:
+            palabras.insert(rng.randrange(len(palabras)), str(rng.randint(1, 2030)))
+        if rng.random() < 0.1:
+            i = rng.randrange(len(palabras))
+            palabras[i] = f"«{palabras[i]}»"
+        fin = rng.choices(".?!", weights=(8, 1, 1))[0]
+        oracion = " ".join(palabras)
+        if rng.random() < 0.2:
+            oracion = oracion.replace(" ", ", ", 1)
+        yield f"{_APERTURA.get(fin, '')}{oracion}{fin}"
+
+
+def _partes_corpus(n_bytes: int, semilla: int) -> Iterator[str]:
+    """Oraciones (con su separador) del corpus sintético hasta ~n_bytes."""
+    rng = random.Random(semilla)
+    tam = 0
+    for i, oracion in enumerate(_oraciones_sinteticas(rng)):
+        if tam >= n_bytes:
+            break
+        sep = "\n\n" if i % 7 == 6 else " "
+        yield oracion + sep
+        tam += len(oracion.encode("utf-8")) + len(sep)
+
+
+def corpus_sintetico(n_bytes: int, semilla: int = 18) -> str:
+    """Devuelve un texto sintético de ~n_bytes (UTF-8) con párrafos de oraciones."""
+    return "".join(_partes_corpus(n_bytes, semilla))
+
+
+def archivo_corpus(mb: float, semilla: int = 18, directorio: Optional[str] = None) -> str:
+    """
+    Ruta de un corpus sintético de `mb` MB guardado en disco; se genera en
+    streaming la primera vez (un corpus de 1 GB no pasa nunca entero por memoria).
+    """
+    directorio = directorio or os.path.join(tempfile.gettempdir(), "benchmarks_18_08")
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"corpus_{mb:g}mb_s{semilla}.txt")
+    if not os.path.exists(ruta):
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            for parte in _partes_corpus(int(mb * 1024 * 1024), semilla):
+                f.write(parte)
+        os.replace(temporal, ruta)
+    return ruta
+
+
+def comentarios_sinteticos(n: int, semilla: int = 18) -> List[str]:
+    """Devuelve n comentarios cortos sintéticos (1-3 oraciones con extras de redes)."""
+    rng = random.Random(semilla)
+    oraciones = _oraciones_sinteticas(rng)
+    comentarios = []
+    for _ in range(n):
+        partes = [next(oraciones) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.4:
+            partes.append(rng.choice(_EXTRAS_COMENTARIO))
+        comentarios.append(" ".join(partes))
+    return comentarios
+
+
+def cargar_script(nombre: str):
+    """Importa un script de esta carpeta por ruta (sirve para 'ejercicio1.1.py')."""
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), nombre)
+    modulo = nombre[:-3].replace(".", "_")
+    spec = importlib.util.spec_from_file_location(modulo, ruta)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _funciones_tokenizacion() -> Dict[str, Callable[..., List[str]]]:
+    """Funciones de los scripts que aceptan backend=, por nombre."""
+    from ejercicio2 import tokenize_spanish
+    from ejercicio3 import limpiar_texto
+
+    ej11 = cargar_script("ejercicio1.1.py")
+    return {
+        "tokenize_spanish": tokenize_spanish,
+        "limpiar_texto": limpiar_texto,
+        "tokenizar_palabras": ej11.tokenizar_palabras,
+    }
+
+
+# Punkt deja ¿ y ¡ pegados a la palabra siguiente; el backend regex los
+# separa a propósito (ver tokenizacion). Para medir el resto de diferencias
+# se compara también contra Punkt con esos signos ya separados.
+_APERTURA_PEGADA = re.compile(r"([¿¡])(?=\w)")
+
+
+def _acuerdo(fn: Callable[..., List[str]], corpus: List[str], normalizar: bool) -> Dict[str, object]:
+    """Compara fn(backend='punkt') con fn(backend='regex') documento a documento."""
+    iguales = 0
+    total = 0
+    solo_punkt: Counter = Counter()
+    solo_regex: Counter = Counter()
+    ejemplo = None
+    for texto in corpus:
+        a = fn(_APERTURA_PEGADA.sub(r"\1 ", texto) if normalizar else texto, backend="punkt")
+        b = fn(texto, backend="regex")
+        total += max(len(a), len(b))
+        if a == b:
+            iguales += 1
+            continue
+        ca, cb = Counter(a), Counter(b)
+        solo_punkt.update(ca - cb)
+        solo_regex.update(cb - ca)
+        if ejemplo is None:
+            i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+            ejemplo = (texto, a[max(0, i - 3):i + 5], b[max(0, i - 3):i + 5])
+    distintos = max(sum(solo_punkt.values()), sum(solo_regex.values()))
+    return {
+        "iguales": iguales,
+        "acuerdo": 1.0 - distintos / total if total else 1.0,
+        "solo_punkt": solo_punkt.most_common(10),
+        "solo_regex": solo_regex.most_common(10),
+        "ejemplo": ejemplo,
+    }
+
+
+def bench_paridad(n_sinteticos: int, semilla: int, min_acuerdo: float) -> bool:
+    """
+    Compara la salida de los backends 'punkt' y 'regex' de cada función sobre
+    CORPUS_REFERENCIA más n_sinteticos comentarios sintéticos.
+
+    Devuelve False si, en alguna función, la fracción de tokens en común
+    (multiconjunto) sin contar la separación de ¿¡ queda por debajo de min_acuerdo.
+    """
+    corpus = list(CORPUS_REFERENCIA) + comentarios_sinteticos(n_sinteticos, semilla)
+    ok = True
+    for nombre, fn in _funciones_tokenizacion().items():
+        crudo = _acuerdo(fn, corpus, normalizar=False)
+        r = _acuerdo(fn, corpus, normalizar=True)
+        ok &= r["acuerdo"] >= min_acuerdo
+        print(f"\n=== {nombre} ===")
+        print(f"  acuerdo de tokens:        {crudo['acuerdo']:.4%} ({crudo['iguales']}/{len(corpus)} documentos idénticos)")
+        print(f"  acuerdo con ¿¡ separados: {r['acuerdo']:.4%} ({r['iguales']}/{len(corpus)} documentos idénticos)")
+        print(f"  solo en punkt: {r['solo_punkt']}")
+        print(f"  solo en regex: {r['solo_regex']}")
+        if r["ejemplo"]:
+            texto, a, b = r["ejemplo"]
+            print(f"  ejemplo: {texto[:80]!r}")
+            print(f"    punkt: {a}")
+            print(f"    regex: {b}")
+    return ok
+
+
+def bench_tokenizador(n_comentarios: int, semilla: int) -> None:
+    """Tokens por segundo de cada función con cada backend sobre comentarios cortos."""
+    comentarios = comentarios_sinteticos(n_comentarios, semilla)
+    print(f"{n_comentarios} comentarios sintéticos (semilla={semilla})")
+    print(f"{'función':<20} {'backend':<8} {'tokens/s':>12} {'speedup':>8}")
+    for nombre, fn in _funciones_tokenizacion().items():
+        fn(comentarios[0], backend="punkt")  # recursos y cachés fuera de la medición
+        base = None
+        for backend in ("punkt", "regex"):
+            t0 = time.perf_counter()
+            total = sum(len(fn(c, backend=backend)) for c in comentarios)
+            dt = time.perf_counter() - t0
+            base = base or dt
+            print(f"{nombre:<20} {backend:<8} {total / dt:>12,.0f} {base / dt:>7.2f}x")
+
+
+def bench_paralelo(mb: float, workers: List[int], semilla: int) -> None:
+    """Mide count_frequencies_parallel con distintos números de procesos."""
+    from ejercicio2 import count_frequencies_parallel, ensure_nltk_data
+
+    ensure_nltk_data()
+    print(f"Generando corpus sintético de {mb} MB (semilla={semilla})...")
+    texto = corpus_sintetico(int(mb * 1024 * 1024), semilla)
+    print(f"CPUs disponibles: {os.cpu_count()}")
+    print(f"{'workers':>8} {'segundos':>10} {'tokens/s':>12} {'speedup':>8}")
+    base = None
+    referencia = None
+    for w in workers:
+        t0 = time.perf_counter()
+        freqs = count_frequencies_parallel(texto, w)
+        dt = time.perf_counter() - t0
+        total = sum(freqs.values())
+        if referencia is None:
+            referencia = freqs
+        elif freqs != referencia:
+            # Los shards se cortan en fronteras de frase de Punkt: el conteo
+            # tiene que ser idéntico al de un solo proceso.
+            dif = sum(((freqs - referencia) + (referencia - freqs)).values())
+            print(f"[Error] Con {w} workers el conteo difiere en {dif} tokens")
+        base = base or dt
+        print(f"{w:>8} {dt:>10.2f} {total / dt:>12,.0f} {base / dt:>7.2f}x")
+
+
+FUNCIONES_SUITE = ("tokenize_spanish", "limpiar_texto", "contar_palabras", "limpiar_y_analizar_comentarios")
+# Funciones que no aceptan backend= (siempre usan Punkt)
+_SOLO_PUNKT = {"limpiar_y_analizar_comentarios"}
+
+
+def _funcion_suite(nombre: str) -> Callable:
+    if nombre == "contar_palabras":
+        return cargar_script("ejercicio1.1.py").contar_palabras
+    if nombre == "limpiar_y_analizar_comentarios":
+        from ejercicio_propuesto5 import limpiar_y_analizar_comentarios
+
+        return limpiar_y_analizar_comentarios
+    return _funciones_tokenizacion()[nombre]
+
+
+def _num_tokens(resultado) -> int:
+    """Tokens producidos por una llamada, sea cual sea el tipo que devuelve."""
+    if isinstance(resultado, int):
+        return resultado
+    if isinstance(resultado, dict):
+        return resultado["tokens_originales"]
+    return len(resultado)
+
+
+def _rss_pico_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _caso_suite(funcion: str, backend: str, corpus: str, tamano: float, semilla: int, directorio: Optional[str]) -> Dict[str, object]:
+    """
+    Ejecuta un caso de la suite. Corre en un proceso hijo propio para que el
+    pico de RSS sea el de este caso (incluye el corpus cargado).
+
+    - corpus 'texto': una llamada sobre el texto entero de `tamano` MB
+    - corpus 'comentarios': una llamada por cada uno de `tamano` comentarios,
+      con percentiles de latencia por llamada
+    """
+    import numpy as np
+
+    fn = _funcion_suite(funcion)
+    kwargs = {} if funcion in _SOLO_PUNKT else {"backend": backend}
+    if funcion == "limpiar_y_analizar_comentarios":
+        llamar = lambda x: fn([x])
+    else:
+        llamar = lambda x: fn(x, **kwargs)
+    if corpus == "texto":
+        with open(archivo_corpus(tamano, semilla, directorio), encoding="utf-8") as f:
+            entradas = [f.read()]
+    else:
+        entradas = comentarios_sinteticos(int(tamano), semilla)
+    llamar(entradas[0][:2000])  # recursos, cachés e imports fuera de la medición
+    rss_inicio = _rss_pico_mb()
+    latencias = array("d")
+    tokens = 0
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    for x in entradas:
+        t = time.perf_counter()
+        tokens += _num_tokens(llamar(x))
+        latencias.append(time.perf_counter() - t)
+    segundos = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    resultado: Dict[str, object] = {
+        "llamadas": len(entradas),
+        "tokens": tokens,
+        "segundos": segundos,
+        "cpu_segundos": cpu,
+        "tokens_por_s": tokens / segundos if segundos else 0.0,
+        "rss_inicio_mb": rss_inicio,
+        "rss_pico_mb": _rss_pico_mb(),
+    }
+    if corpus == "comentarios":
+        p50, p95, p99 = np.percentile(np.frombuffer(latencias, dtype=np.float64), [50, 95, 99]) * 1e6
+        resultado["latencia_us"] = {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+    return resultado
+
+
+def bench_suite(
+    mbs: List[float],
+    n_comentarios: int,
+    funciones: List[str],
+    backends: List[str],
+    semilla: int,
+    directorio: Optional[str],
+) -> Dict[str, object]:
+    """
+    Mide cada función con cada backend sobre los corpus de texto de `mbs` MB
+    y sobre n_comentarios comentarios cortos. Devuelve el informe (dict
+    serializable a JSON) con los casos por nombre 'función/backend/corpus'.
+    """
+    from nltk import __version__ as version_nltk
+
+    casos = []
+    for mb in mbs:
+        archivo_corpus(mb, semilla, directorio)  # generar fuera de las mediciones
+        casos += [(f, b, "texto", mb) for f in funciones if f not in _SOLO_PUNKT for b in backends]
+    casos += [
+        (f, b, "comentarios", n_comentarios)
+        for f in funciones
+        for b in (["punkt"] if f in _SOLO_PUNKT else backends)
+    ]
+    informe: Dict[str, object] = {
+        "meta": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "nltk": version_nltk,
+            "semilla": semilla,
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "casos": {},
+    }
+    print(f"{'caso':<52} {'tokens/s':>12} {'p95 (us)':>10} {'RSS pico MB':>12}")
+    for funcion, backend, corpus, tamano in casos:
+        nombre = f"{funcion}/{backend}/{corpus}_{tamano:g}{'mb' if corpus == 'texto' else ''}"
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            r = executor.submit(_caso_suite, funcion, backend, corpus, tamano, semilla, directorio).result()
+        informe["casos"][nombre] = r
+        p95 = r.get("latencia_us", {}).get("p95")
+        rss = r["rss_pico_mb"]
+        print(
+            f"{nombre:<52} {r['tokens_por_s']:>12,.0f} "
+            f"{'-' if p95 is None else f'{p95:,.0f}':>10} {'-' if rss is None else f'{rss:,.0f}':>12}"
+        )
+    return informe
+
+
+def comparar_informes(actual: Dict[str, object], base: Dict[str, object], tolerancia: float) -> List[str]:
+    """
+    Regresiones de `actual` frente a `base` en los casos comunes: tokens/s
+    más bajo, latencia p95 o pico de RSS más altos que la base en más de
+    `tolerancia` (fracción).
+    """
+    regresiones = []
+    for nombre, r in actual["casos"].items():
+        b = base["casos"].get(nombre)
+        if b is None:
+            continue
+        metricas = [("tokens/s", r["tokens_por_s"], b["tokens_por_s"], False)]
+        if "latencia_us" in r and "latencia_us" in b:
+            metricas.append(("latencia p95", r["latencia_us"]["p95"], b["latencia_us"]["p95"], True))
+        if r["rss_pico_mb"] is not None and b.get("rss_pico_mb") is not None:
+            metricas.append(("RSS pico", r["rss_pico_mb"], b["rss_pico_mb"], True))
+        for metrica, valor, referencia, mayor_es_peor in metricas:
+            if not referencia:
+                continue
+            cambio = valor / referencia - 1.0
+            if (cambio if mayor_es_peor else -cambio) > tolerancia:
+                regresiones.append(f"{nombre}: {metrica} {referencia:,.1f} -> {valor:,.1f} ({cambio:+.1%})")
+    return regresiones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("paralelo", help="speedup de count_frequencies_parallel por número de procesos")
+    p.add_argument("--mb", type=float, default=300, help="tamaño del corpus sintético en MB")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--semilla", type=int, default=18)
+
+    p = sub.add_parser("paridad", help="diferencias entre los backends 'punkt' y 'regex'")
+    p.add_argument("--sinteticos", type=int, default=2000, help="comentarios sintéticos además del corpus de referencia")
+    p.add_argument("--min-acuerdo", type=float, default=0.95, help="acuerdo de tokens mínimo para salir con código 0")
+    p.add_argument("--semilla", type=int, default=18)
+
+    p = sub.add_parser("tokenizador", help="tokens/s por función y backend")
+    p.add_argument("--comentarios", type=int, default=50000)
+    p.add_argument("--semilla", type=int, default=18)
+
+    p = sub.add_parser("suite", help="tokens/s, latencias y RSS pico por función; informe JSON y comparación")
+    p.add_argument("--mb", type=float, nargs="*", default=[1, 10], help="tamaños de los corpus de texto (1 a 1024 MB)")
+    p.add_argument("--comentarios", type=int, default=20000, help="comentarios cortos para las latencias por llamada")
+    p.add_argument("--funciones", nargs="+", choices=FUNCIONES_SUITE, default=list(FUNCIONES_SUITE))
+    p.add_argument("--backends", nargs="+", choices=("punkt", "regex"), default=["punkt", "regex"])
+    p.add_argument("--semilla", type=int, default=18)
+    p.add_argument("--directorio-corpus", help="dónde guardar los corpus generados (por defecto, en el temporal)")
+    p.add_argument("--salida", help="ruta del informe JSON")
+    p.add_argument("--comparar", help="informe JSON de referencia; sale con código 1 si hay regresiones")
+    p.add_argument("--tolerancia", type=float, default=0.15, help="empeoramiento relativo permitido frente a la referencia")
+
+    args = parser.parse_args()
+    if args.comando == "paralelo":
+        bench_paralelo(args.mb, args.workers, args.semilla)
+    elif args.comando == "paridad":
+        if not bench_paridad(args.sinteticos, args.semilla, args.min_acuerdo):
+            sys.exit(1)
+    elif args.comando == "tokenizador":
+        bench_tokenizador(args.comentarios, args.semilla)
+    elif args.comando == "suite":
+        informe = bench_suite(args.mb, args.comentarios, args.funciones, args.backends, args.semilla, args.directorio_corpus)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as f:
+                json.dump(informe, f, indent=2, ensure_ascii=False)
+            print(f"Informe guardado en {args.salida}")
+        if args.comparar:
+            with open(args.comparar, encoding="utf-8") as f:
+                base = json.load(f)
+            regresiones = comparar_informes(informe, base, args.tolerancia)
+            for r in regresiones:
+                print(f"[Regresión] {r}")
+            if regresiones:
+                sys.exit(1)
+            comunes = len(set(informe["casos"]) & set(base["casos"]))
+            print(f"Sin regresiones en {comunes} casos comunes con {args.comparar} (tolerancia {args.tolerancia:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Caché de tokenizaciones indexada por hash del contenido + ajustes del tokenizador.
+
+Dos niveles, ambos con expulsión por tamaño:
+  - memoria: LRU acotada por número total de tokens guardados
+  - disco (opcional): un archivo por entrada en `directorio`, acotado en
+    bytes; al pasarse del límite se borran las entradas usadas hace más tiempo
+
+Los tokens se guardan como tuplas (inmutables) y en disco como texto UTF-8
+separado por saltos de línea: ningún token contiene espacios en blanco.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Sequence, Tuple
+
+
+class CacheTokens:
+    """Caché LRU en memoria + caché en disco opcional de listas de tokens."""
+
+    def __init__(
+        self,
+        max_tokens_memoria: int = 5_000_000,
+        directorio: str | None = None,
+        max_bytes_disco: int = 512 * 1024 * 1024,
+    ):
+        self.max_tokens_memoria = max_tokens_memoria
+        self.directorio = directorio
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._tokens_memoria = 0
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.fallos = 0
+        self._bytes_disco = 0
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+            self._bytes_disco = sum(e.stat().st_size for e in os.scandir(directorio) if e.name.endswith(".tok"))
+
+    @staticmethod
+    def clave(texto: str, ajustes: Hashable) -> str:
+        """Hash del contenido y de los ajustes del tokenizador."""
+        h = hashlib.blake2b(repr(ajustes).encode("utf-8"), digest_size=20)
+        h.update(b"\0")
+        h.update(texto.encode("utf-8"))
+        return h.hexdigest()
+
+    def obtener(self, texto: str, ajustes: Hashable, calcular: Callable[[], Sequence[str]]) -> Tuple[str, ...]:
+        """
+        Tokens de `texto` con `ajustes`: de memoria, de disco o, si no están,
+        llamando a calcular() y guardando el resultado en ambos niveles.
+        """
+        k = self.clave(texto, ajustes)
+        tokens = self._memoria.get(k)
+        if tokens is not None:
+            self._memoria.move_to_end(k)
+            self.hits_memoria += 1
+            return tokens
+        tokens = self._leer_disco(k)
+        if tokens is not None:
+            self.hits_disco += 1
+        else:
+            self.fallos += 1
+            tokens = tuple(calcular())
+            self._escribir_disco(k, tokens)
+        self._guardar_memoria(k, tokens)
+        return tokens
+
+    def _guardar_memoria(self, k: str, tokens: Tuple[str, ...]) -> None:
+        if len(tokens) > self.max_tokens_memoria:
+            return
+        self._memoria[k] = tokens
+        self._tokens_memoria += len(tokens)
+        while self._tokens_memoria > self.max_tokens_memoria:
+            _, viejos = self._memoria.popitem(last=False)
+            self._tokens_memoria -= len(viejos)
+
+    def _ruta(self, k: str) -> str:
+        return os.path.join(self.directorio, k + ".tok")
+
+    def _leer_disco(self, k: str) -> Tuple[str, ...] | None:
+        if not self.directorio:
+            return None
+        ruta = self._ruta(k)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                contenido = f.read()
+            os.utime(ruta)  # marca la entrada como usada recientemente
+        except OSError:
+            return None
+        return tuple(contenido.split("\n")) if contenido else ()
+
+    def _escribir_disco(self, k: str, tokens: Tuple[str, ...]) -> None:
+        if not self.directorio:
+            return
+        datos = "\n".join(tokens).encode("utf-8")
+        if len(datos) > self.max_bytes_disco:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(datos)
+        os.replace(tmp, self._ruta(k))
+        self._bytes_disco += len(datos)
+        if self._bytes_disco > self.max_bytes_disco:
+            self._expulsar_disco()
+
+    def _expulsar_disco(self) -> None:
+        """Borra las entradas menos usadas hasta quedar en el 90% del límite."""
+        entradas = sorted(
+            (e.stat().st_mtime, e.stat().st_size, e.path)
+            for e in os.scandir(self.directorio) if e.name.endswith(".tok")
+        )
+        total = sum(tam for _, tam, _ in entradas)
+        objetivo = int(self.max_bytes_disco * 0.9)
+        for _, tam, ruta in entradas:
+            if total <= objetivo:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                continue
+            total -= tam
+        self._bytes_disco = total
+
+    def limpiar(self) -> None:
+        """Vacía la caché en memoria (la de disco se conserva)."""
+        self._memoria.clear()
+        self._tokens_memoria = 0
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Contadores de aciertos/fallos y ocupación de cada nivel."""
+        consultas = self.hits_memoria + self.hits_disco + self.fallos
+        return {
+            "hits_memoria": self.hits_memoria,
+            "hits_disco": self.hits_disco,
+            "fallos": self.fallos,
+            "tasa_aciertos": (self.hits_memoria + self.hits_disco) / consultas if consultas else 0.0,
+            "entradas_memoria": len(self._memoria),
+            "tokens_memoria": self._tokens_memoria,
+            "bytes_disco": self._bytes_disco,
+        }
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Concordancias (keyword in context, KWIC) y conteo exacto de frases con un
+array de sufijos a nivel de palabra.
+
+Concordancia indexa uno o varios textos: cada palabra (y número) en
+minúsculas recibe un rango según el orden alfabético del vocabulario, y el
+array de sufijos ordena todas las posiciones por la secuencia de palabras
+que empieza en ellas. Así, todas las apariciones de una frase quedan
+contiguas y se encuentran con dos búsquedas binarias: contar una frase
+cuesta O(m log n) para una frase de m palabras, sin recorrer el texto.
+
+El array se construye con prefix doubling vectorizado en NumPy
+(O(n log² n)). Los tokens se guardan como offsets (inicio, fin) en el texto
+original, así que el contexto de cada aparición se recorta tal cual, con
+su puntuación. La puntuación no se indexa: "hola, mundo" coincide con la
+frase "hola mundo". Entre documentos se pone un separador, así que ninguna
+frase cruza de un documento a otro.
+
+guardar/cargar usan .npz sin pickle (textos, vocabulario, offsets y array).
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from tokenizacion import spans_regex
+from vocabulario import Vocabulario, bloque_utf8, cadenas_utf8, guardar_arrays
+
+
+def _array_sufijos(s: np.ndarray) -> np.ndarray:
+    """Array de sufijos de una secuencia de enteros (prefix doubling)."""
+    n = len(s)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    rango = s.astype(np.int64)
+    k = 1
+    while True:
+        segundo = np.full(n, -1, dtype=np.int64)
+        if k < n:
+            segundo[: n - k] = rango[k:]
+        sa = np.lexsort((segundo, rango))
+        r, q = rango[sa], segundo[sa]
+        nuevos = np.zeros(n, dtype=np.int64)
+        np.cumsum((r[1:] != r[:-1]) | (q[1:] != q[:-1]), out=nuevos[1:])
+        rango = np.empty(n, dtype=np.int64)
+        rango[sa] = nuevos
+        if nuevos[-1] == n - 1 or k >= n:
+            return sa
+        k *= 2
+
+
+def _palabras(texto: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Palabras y números del texto en minúsculas, con sus offsets."""
+    palabras, spans = [], []
+    for inicio, fin in spans_regex(texto):
+        if texto[inicio].isalnum():
+            palabras.append(texto[inicio:fin].lower())
+            spans.append((inicio, fin))
+    return palabras, spans
+
+
+class Concordancia:
+    """Índice de concordancias de uno o varios textos."""
+
+    def __init__(self, textos: Iterable[str]):
+        self.textos: List[str] = list(textos)
+        self.vocabulario = Vocabulario()
+        ids, inicios, fines, documentos = [], [], [], []
+        for d, texto in enumerate(self.textos):
+            palabras, spans = _palabras(texto)
+            ids.append(self.vocabulario.codificar(palabras).astype(np.int64))
+            ids.append(np.array([-1]))  # separador de documentos
+            arr = np.array(spans, dtype=np.int64).reshape(-1, 2)
+            inicios.append(np.append(arr[:, 0], len(texto)))
+            fines.append(np.append(arr[:, 1], len(texto)))
+            documentos.append(np.full(len(palabras) + 1, d, dtype=np.int64))
+        ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+        self.inicios = np.concatenate(inicios) if inicios else np.empty(0, dtype=np.int64)
+        self.fines = np.concatenate(fines) if fines else np.empty(0, dtype=np.int64)
+        self.documentos = np.concatenate(documentos) if documentos else np.empty(0, dtype=np.int64)
+        self._indexar(ids)
+
+    def _indexar(self, ids: np.ndarray) -> None:
+        palabras = self.vocabulario.palabras
+        # Rango alfabético de cada id; 0 queda para el separador
+        orden = np.array(sorted(range(len(palabras)), key=palabras.__getitem__), dtype=np.int64)
+        self._rango_id = np.empty(len(palabras), dtype=np.int64)
+        self._rango_id[orden] = np.arange(1, len(palabras) + 1)
+        self.secuencia = np.zeros(len(ids), dtype=np.int64)
+        son_palabras = ids >= 0
+        self.secuencia[son_palabras] = self._rango_id[ids[son_palabras]]
+        self.sufijos = _array_sufijos(self.secuencia)
+
+    @classmethod
+    def desde_corpus(cls, source: str) -> "Concordancia":
+        """Indexa los archivos de un directorio o glob (ver iter_corpus_files)."""
+        from ejercicio2 import iter_corpus_files
+
+        def leer(ruta: str) -> str:
+            with open(ruta, "r", encoding="utf-8") as f:
+                return f.read()
+
+        return cls(leer(ruta) for ruta in iter_corpus_files(source))
+
+    # -- búsqueda -----------------------------------------------------------
+
+    def _rangos(self, frase: str) -> List[int] | None:
+        palabras, _ = _palabras(frase)
+        rangos = []
+        for w in palabras:
+            i = self.vocabulario.id(w)
+            if i < 0:
+                return None
+            rangos.append(int(self._rango_id[i]))
+        return rangos
+
+    def _intervalo(self, frase: str) -> Tuple[int, int]:
+        """Intervalo [lo, hi) del array de sufijos que empieza por la frase."""
+        rangos = self._rangos(frase)
+        if not rangos:
+            return 0, 0
+        m = len(rangos)
+        secuencia, sufijos = self.secuencia, self.sufijos
+        clave = lambda i: secuencia[sufijos[i]:sufijos[i] + m].tolist()
+        lo = bisect_left(range(len(sufijos)), rangos, key=clave)
+        hi = bisect_right(range(len(sufijos)), rangos, lo=lo, key=clave)
+        return lo, hi
+
+    def contar(self, frase: str) -> int:
+        """Apariciones exactas de la frase (sin distinguir mayúsculas)."""
+        lo, hi = self._intervalo(frase)
+        return hi - lo
+
+    def posiciones(self, frase: str) -> np.ndarray:
+        """Posiciones (índice de palabra) de cada aparición, en orden de texto."""
+        lo, hi = self._intervalo(frase)
+        return np.sort(self.sufijos[lo:hi])
+
+    def kwic(self, frase: str, contexto: int = 5, limite: int | None = None) -> List[Tuple[int, str, str, str]]:
+        """
+        Concordancias de la frase: (documento, contexto izquierdo, coincidencia,
+        contexto derecho), con `contexto` palabras a cada lado recortadas del
+        texto original, en orden de aparición.
+        """
+        m = len(_palabras(frase)[0])
+        posiciones = self.posiciones(frase)[:limite]
+        resultado = []
+        for p in posiciones:
+            d = int(self.documentos[p])
+            texto = self.textos[d]
+            izq = max(p - contexto, 0)
+            while self.documentos[izq] != d:
+                izq += 1
+            fin = p + m - 1
+            # El separador del documento marca el final del contexto derecho
+            der = min(fin + contexto, len(self.secuencia) - 1)
+            while self.documentos[der] != d:
+                der -= 1
+            resultado.append((
+                d,
+                texto[self.inicios[izq]:self.inicios[p]].strip(),
+                texto[self.inicios[p]:self.fines[fin]],
+                texto[self.fines[fin]:self.fines[der]].strip(),
+            ))
+        return resultado
+
+    def imprimir_kwic(self, frase: str, contexto: int = 5, limite: int | None = 20, ancho: int = 40) -> None:
+        """Muestra las concordancias alineadas en columna."""
+        for _, izq, palabra, der in self.kwic(frase, contexto, limite):
+            print(f"{izq[-ancho:]:>{ancho}}  [{palabra}]  {der[:ancho]}")
+
+    # -- persistencia -------------------------------------------------------
+
+    def guardar(self, ruta: str, comprimido: bool = True) -> None:
+        """
+        Guarda índice y textos en formato .npz (bloques UTF-8 + offsets, sin
+        pickle) exactamente en `ruta`, sin añadirle la extensión .npz.
+        """
+        textos_utf8, textos_offsets = bloque_utf8(self.textos)
+        vocab_utf8, vocab_offsets = bloque_utf8(self.vocabulario.palabras)
+        guardar_arrays(
+            ruta,
+            comprimido,
+            textos_utf8=textos_utf8,
+            textos_offsets=textos_offsets,
+            vocabulario_utf8=vocab_utf8,
+            vocabulario_offsets=vocab_offsets,
+            rango_id=self._rango_id,
+            secuencia=self.secuencia,
+            sufijos=self.sufijos,
+            inicios=self.inicios,
+            fines=self.fines,
+            documentos=self.documentos,
+        )
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "Concordancia":
+        """Carga lo guardado con guardar (sin reconstruir el array de sufijos)."""
+        obj = cls.__new__(cls)
+        with np.load(ruta, allow_pickle=False) as f:
+            obj.textos = cadenas_utf8(f["textos_utf8"], f["textos_offsets"])
+            obj.vocabulario = Vocabulario(cadenas_utf8(f["vocabulario_utf8"], f["vocabulario_offsets"]))
+            for nombre in ("rango_id", "secuencia", "sufijos", "inicios", "fines", "documentos"):
+                setattr(obj, nombre if nombre != "rango_id" else "_rango_id", f[nombre])
+        return obj
+
+
+if __name__ == "__main__":
+    numeros = "uno dos tres cuatro cinco seis siete ocho nueve diez once doce"
+    c = Concordancia([numeros, "", "¡...!", numeros.upper()])
+    for contexto in (0, 2, 5):
+        for d, izq, palabra, der in c.kwic("seis", contexto):
+            assert len(izq.split()) == contexto and len(der.split()) == contexto, (contexto, izq, der)
+    assert c.contar("Cinco seis") == 2 and c.contar("doce uno") == 0
+    assert Concordancia([""]).contar("hola") == 0 and Concordancia(["."]).kwic("hola") == []
+    c.imprimir_kwic("seis", contexto=2)
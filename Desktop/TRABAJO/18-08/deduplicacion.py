@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Detección de comentarios casi duplicados con MinHash + LSH por bandas.
+
+Cada comentario se reduce al conjunto de tokens de limpiar_texto
+(ejercicio3.py). Su firma MinHash tiene num_perm mínimos de funciones hash
+multiply-shift; la probabilidad de que dos firmas coincidan en una posición
+es la similitud de Jaccard de los conjuntos.
+
+La firma se parte en `bandas` bandas de r = num_perm / bandas filas y cada
+banda se usa como clave de un diccionario: dos comentarios son candidatos
+si coinciden en alguna banda, sin comparar todos contra todos. Los
+candidatos se confirman comparando la firma con la del representante del
+grupo (Jaccard estimado >= umbral). El índice es incremental (online): cada
+comentario se asigna a un grupo existente o abre uno nuevo al llegar.
+
+Memoria: una firma por grupo (no por comentario) y una entrada por banda.
+Con num_perm=64 y bandas=16 (r=4) la probabilidad de ser candidato es del
+50% para Jaccard ~0.5 y > 99% a partir de Jaccard 0.8.
+"""
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from itertools import tee
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=1 << 18)
+def _hash64(token: str) -> int:
+    """Hash de 64 bits estable entre procesos (hash() de Python no lo es)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class DeduplicadorMinHash:
+    """Índice LSH incremental que agrupa conjuntos de tokens casi iguales."""
+
+    def __init__(self, num_perm: int = 64, bandas: int = 16, umbral: float = 0.8, semilla: int = 5474):
+        if num_perm % bandas:
+            raise ValueError("num_perm debe ser múltiplo de bandas")
+        rng = np.random.default_rng(semilla)
+        # multiply-shift: h(x) = (a*x + b) mod 2^64 >> 32, con a impar
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.bandas = bandas
+        self.filas = num_perm // bandas
+        self.umbral = umbral
+        self._buckets: List[Dict[bytes, int]] = [{} for _ in range(bandas)]
+        self._firmas: Dict[int, np.ndarray] = {}
+        self.tamanos: Dict[int, int] = {}
+        self.total = 0
+
+    def firma(self, tokens: Iterable[str]) -> np.ndarray | None:
+        """Firma MinHash (uint32) del conjunto de tokens, o None si está vacío."""
+        conjunto = set(tokens)
+        if not conjunto:
+            return None
+        h = np.fromiter((_hash64(t) for t in conjunto), dtype=np.uint64, count=len(conjunto))
+        return ((np.multiply.outer(h, self._a) + self._b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+    def agregar(self, tokens: Iterable[str]) -> Tuple[int, bool]:
+        """
+        Asigna el comentario a un grupo. Devuelve (id del grupo, es_nuevo);
+        es_nuevo es False si es casi duplicado de uno anterior. Los
+        comentarios sin tokens forman cada uno su propio grupo.
+        """
+        doc = self.total
+        self.total += 1
+        sig = self.firma(tokens)
+        if sig is None:
+            self.tamanos[doc] = 1
+            return doc, True
+        claves = [sig[i * self.filas:(i + 1) * self.filas].tobytes() for i in range(self.bandas)]
+        vistos = set()
+        for banda, clave in zip(self._buckets, claves):
+            grupo = banda.get(clave)
+            if grupo is None or grupo in vistos:
+                continue
+            vistos.add(grupo)
+            if np.count_nonzero(self._firmas[grupo] == sig) >= self.umbral * self.num_perm:
+                self.tamanos[grupo] += 1
+                return grupo, False
+        self._firmas[doc] = sig
+        self.tamanos[doc] = 1
+        for banda, clave in zip(self._buckets, claves):
+            banda.setdefault(clave, doc)
+        return doc, True
+
+    @property
+    def grupos(self) -> int:
+        return len(self.tamanos)
+
+
+def filtrar_casi_duplicados(
+    comentarios: Iterable[str],
+    deduplicador: DeduplicadorMinHash | None = None,
+    backend: str = "regex",
+    tokens: Iterable[Sequence[str]] | None = None,
+) -> Iterator[str]:
+    """
+    Genera solo el primer comentario de cada grupo de casi duplicados, de
+    forma perezosa (`comentarios` puede ser un flujo).
+
+    Los conjuntos de tokens salen de limpiar_textos (ejercicio3.py) con el
+    backend indicado ('regex' por defecto, para seguir el ritmo de flujos de
+    cientos de miles de comentarios por minuto), salvo que se pasen ya
+    calculados en `tokens`, en el mismo orden que los comentarios.
+    """
+    from ejercicio3 import limpiar_textos
+
+    deduplicador = DeduplicadorMinHash() if deduplicador is None else deduplicador
+    if tokens is None:
+        # Perezoso: cada comentario se limpia justo antes de agruparlo
+        comentarios, para_limpiar = tee(comentarios)
+        tokens = limpiar_textos(para_limpiar, backend=backend)
+    for comentario, toks in zip(comentarios, tokens):
+        _, nuevo = deduplicador.agregar(toks)
+        if nuevo:
+            yield comentario
@@ -1,11 +1,12 @@
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
+from array import array
+
+from nltk.tokenize.destructive import NLTKWordTokenizer
+
+from recursos_nltk import asegurar_tokenizador, tokenizador_frases
+from tokenizacion import frases_punkt, spans_regex, tokenizar, validar_backend
 
 # Asegurar el recurso de 'punkt' solo si no está disponible
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+asegurar_tokenizador()
 
 # Párrafo de noticias de ejemplo (puedes reemplazar por otro texto)
 parrafo = (
@@ -14,56 +15,140 @@ parrafo = (
     "Las autoridades recomiendan a la población prioritaria acudir a los centros de salud y seguir las medidas de prevención."
 )
 
-def tokenizar_palabras(texto: str):
-    """Tokeniza el texto en palabras y signos de puntuación."""
-    return word_tokenize(texto, language='spanish')
+def tokenizar_palabras(texto: str, backend: str = 'punkt'):
+    """Tokeniza el texto en palabras y signos de puntuación ('punkt' o 'regex')."""
+    return tokenizar(texto, backend)
 
 def solo_palabras(tokens):
     """Filtra y devuelve solo los tokens que son palabras (ignora puntuación y números)."""
     return [t for t in tokens if t.isalpha()]
 
-def contar_palabras(texto: str) -> int:
+def contar_palabras(texto: str, backend: str = 'punkt') -> int:
     """Cuenta la cantidad de palabras en el texto (ignora puntuación y números)."""
-    tokens = tokenizar_palabras(texto)
+    tokens = tokenizar_palabras(texto, backend)
     palabras = solo_palabras(tokens)
     return len(palabras)
 
 def separar_frases(texto: str):
     """Separa el texto en frases usando el tokenizador de oraciones."""
-    return sent_tokenize(texto, language='spanish')
+    return frases_punkt(texto, 'spanish')
 
 def frase_mas_larga_por_palabras(frases):
     """Devuelve la frase con más palabras (ignorando puntuación y números) y su conteo."""
-    def contar_en_frase(frase):
-        return len(solo_palabras(tokenizar_palabras(frase)))
     if not frases:
         return "", 0
-    frase = max(frases, key=contar_en_frase)
-    return frase, contar_en_frase(frase)
+    # Cada frase se tokeniza una sola vez
+    cuentas = [len(solo_palabras(tokenizar_palabras(f))) for f in frases]
+    i = max(range(len(frases)), key=cuentas.__getitem__)
+    return frases[i], cuentas[i]
+
+
+class Documento:
+    """
+    Texto segmentado una sola vez en frases y palabras.
+
+    Solo se guardan offsets (inicio, fin) sobre el texto original en arrays
+    compactos, nunca subcadenas: las frases y los tokens se recortan bajo
+    demanda. El conteo de palabras de cada frase se calcula al segmentar, así
+    que la frase más larga y las cuentas por frase no vuelven a tokenizar.
+
+    Como los tokens se recortan del original, unas comillas " siguen siendo "
+    (word_tokenize las convierte en `` y '').
+    """
+
+    def __init__(self, texto: str, backend: str = 'punkt'):
+        self.texto = texto
+        self.backend = validar_backend(backend)
+        self._frases = array('L')          # inicio, fin de cada frase (pares)
+        self._tokens = array('L')          # inicio, fin de cada token (pares)
+        self._primer_token = array('L')    # índice del primer token de cada frase (+ total)
+        self.palabras_por_frase = array('L')
+        self._segmentar()
+
+    def _segmentar(self) -> None:
+        texto = self.texto
+        palabras_tok = NLTKWordTokenizer() if self.backend == 'punkt' else None
+        for ini, fin in tokenizador_frases('spanish').span_tokenize(texto):
+            self._frases.extend((ini, fin))
+            self._primer_token.append(len(self._tokens) // 2)
+            if palabras_tok is not None:
+                # NLTKWordTokenizer necesita la frase como cadena; los offsets se
+                # pasan a coordenadas del texto completo
+                spans = ((ini + a, ini + b) for a, b in palabras_tok.span_tokenize(texto[ini:fin]))
+            else:
+                spans = spans_regex(texto, ini, fin)
+            palabras = 0
+            for a, b in spans:
+                self._tokens.extend((a, b))
+                palabras += texto[a:b].isalpha()
+            self.palabras_por_frase.append(palabras)
+        self._primer_token.append(len(self._tokens) // 2)
+
+    @property
+    def num_frases(self) -> int:
+        return len(self.palabras_por_frase)
+
+    def span_frase(self, i: int):
+        """Offsets (inicio, fin) de la frase i."""
+        return self._frases[2 * i], self._frases[2 * i + 1]
+
+    def frase(self, i: int) -> str:
+        ini, fin = self.span_frase(i)
+        return self.texto[ini:fin]
+
+    def frases(self):
+        """Lista de frases (recortadas del texto original)."""
+        return [self.frase(i) for i in range(self.num_frases)]
+
+    def spans_tokens(self, i: int | None = None):
+        """Offsets de los tokens de la frase i, o de todo el documento si i es None."""
+        desde, hasta = (0, self._primer_token[-1]) if i is None else (self._primer_token[i], self._primer_token[i + 1])
+        t = self._tokens
+        return [(t[2 * k], t[2 * k + 1]) for k in range(desde, hasta)]
+
+    def tokens(self, i: int | None = None):
+        """Tokens (palabras y signos) de la frase i, o de todo el documento."""
+        texto = self.texto
+        return [texto[a:b] for a, b in self.spans_tokens(i)]
+
+    def contar_palabras(self) -> int:
+        """Palabras del documento (ignorando puntuación y números)."""
+        return sum(self.palabras_por_frase)
+
+    def frase_mas_larga(self):
+        """La frase con más palabras y su conteo, sin volver a tokenizar."""
+        if not self.num_frases:
+            return "", 0
+        cuentas = self.palabras_por_frase
+        i = max(range(len(cuentas)), key=cuentas.__getitem__)
+        return self.frase(i), cuentas[i]
 
 if __name__ == "__main__":
+    # El documento se segmenta una sola vez; todo lo demás sale de sus offsets
+    doc = Documento(parrafo)
+
     # 1) Tokenizar un párrafo de noticias
-    tokens = tokenizar_palabras(parrafo)
+    tokens = doc.tokens()
     print("Tokens (incluye puntuación):")
     print(tokens)
 
     # 2) Contar cuántas palabras tiene (ignorando puntuación)
-    cantidad_palabras = contar_palabras(parrafo)
+    cantidad_palabras = doc.contar_palabras()
     print("\nCantidad de palabras (sin puntuación/ni números):", cantidad_palabras)
 
     # 3) Separar frases y mostrar la más larga
-    frases = separar_frases(parrafo)
+    frases = doc.frases()
     print("\nFrases detectadas:")
     for i, f in enumerate(frases, start=1):
         print(f"{i}. {f}")
 
-    frase_larga, cuenta = frase_mas_larga_por_palabras(frases)
+    frase_larga, cuenta = doc.frase_mas_larga()
     print("\nFrase más larga por cantidad de palabras:")
     print(f"\"{frase_larga}\"")
     print("Palabras en la frase más larga:", cuenta)
 
     # 4) Calcular la cantidad de palabras en cada frase
-    cuentas_palabras = [contar_palabras(f) for f in frases]
+    cuentas_palabras = doc.palabras_por_frase
     print("\nCantidad de palabras en cada frase:")
     for i, c in enumerate(cuentas_palabras, start=1):        
         print(f"{i}. {c}")
\ No newline at end of file
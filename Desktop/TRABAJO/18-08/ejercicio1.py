@@ -1,8 +1,9 @@
-import nltk 
-nltk.download('punkt')
+from recursos_nltk import asegurar_tokenizador
+from tokenizacion import palabras_punkt
 
-from nltk.tokenize import word_tokenize
+# Punkt del paquete local (recursos_nltk) o, si no hay paquete, de nltk_data
+asegurar_tokenizador()
 
 texto = "hola, software"
-tokems = word_tokenize(texto)
+tokems = palabras_punkt(texto, 'english')
 print(tokems)
\ No newline at end of file
@@ -12,16 +12,27 @@ En la primera ejecución puede ser necesario descargar recursos de NLTK
 from __future__ import annotations
 
 import os
-from typing import List, Tuple, Dict
+import re
+import glob
+from functools import partial
+from typing import List, Tuple, Dict, Iterable, Iterator
 from collections import Counter
-
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 import numpy as np
 from scipy.stats import zscore, entropy
 
+from cache_tokens import CacheTokens
+from frecuencias_aprox import SpaceSaving
+from instrumentacion import Instrumentacion, Perfil, etapa
+from ngramas import ContadorNGramas
+from paralelo import map_acotado
+from recursos_nltk import asegurar_recursos, asegurar_tokenizador, stopwords_idioma, tokenizador_frases
+from stemming import StemmerCacheado
+from tabla_frecuencias import TablaFrecuencias, fusionar_tablas
+from tokenizacion import palabras_regex, tokenizar, validar_backend
+from vocabulario import TokensCodificados, Vocabulario
+
 # Graficación
 import matplotlib.pyplot as plt
 # Estilo agradable por defecto; si no está disponible, cae a 'ggplot'
@@ -34,21 +45,18 @@ except Exception:
 def ensure_nltk_data() -> None:
     """
     Descarga silenciosamente los recursos de NLTK necesarios si no están presentes.
+    Solo la primera llamada del proceso consulta NLTK (ver recursos_nltk).
     """
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt", quiet=True)
-    try:
-        nltk.data.find("corpora/stopwords")
-    except LookupError:
-        nltk.download("stopwords", quiet=True)
+    asegurar_tokenizador()
+    asegurar_recursos("stopwords")
 
 
 def tokenize_spanish(
     text: str,
     lowercase: bool = True,
-    remove_stopwords: bool = False
+    remove_stopwords: bool = False,
+    backend: str = "punkt",
+    profile: Perfil | None = None
 ) -> List[str]:
     """
     Tokeniza texto en español, con opciones para normalizar.
@@ -56,33 +64,268 @@ def tokenize_spanish(
     - Convierte a minúsculas (opcional)
     - Elimina puntuación (mantiene solo tokens alfabéticos)
     - Elimina stopwords en español (opcional)
+    - backend: 'punkt' (word_tokenize de NLTK) o 'regex' (ver tokenizacion)
+    - profile: Perfil (instrumentacion) en el que medir cada paso
     """
-    ensure_nltk_data()
-    tokens = word_tokenize(text, language="spanish")
-    if lowercase:
-        tokens = [t.lower() for t in tokens]
-    # Mantener solo palabras alfabéticas (incluye letras con acentos)
-    tokens = [t for t in tokens if t.isalpha()]
+    if validar_backend(backend) == "regex":
+        # Con regex conviene pasar a minúsculas el texto entero de una vez
+        if lowercase:
+            with etapa(profile, "lowercase", text) as e:
+                text = text.lower()
+                e.sumar_salidas(text)
+        with etapa(profile, "regex", text) as e:
+            tokens = palabras_regex(text)
+            e.sumar_salidas(tokens)
+    else:
+        ensure_nltk_data()
+        with etapa(profile, "punkt", text) as e:
+            tokens = tokenizar(text, backend)
+            e.sumar_salidas(tokens)
+        if lowercase:
+            with etapa(profile, "lowercase", tokens) as e:
+                tokens = [t.lower() for t in tokens]
+                e.sumar_salidas(tokens)
+        # Mantener solo palabras alfabéticas (incluye letras con acentos)
+        with etapa(profile, "isalpha", tokens) as e:
+            tokens = [t for t in tokens if t.isalpha()]
+            e.sumar_salidas(tokens)
     if remove_stopwords:
-        stops = set(stopwords.words("spanish"))
-        tokens = [t for t in tokens if t not in stops]
+        with etapa(profile, "stopwords", tokens) as e:
+            stops = stopwords_idioma("spanish")
+            tokens = [t for t in tokens if t not in stops]
+            e.sumar_salidas(tokens)
     return tokens
 
 
-def count_frequencies(tokens: List[str]) -> Counter:
+def count_frequencies(tokens: List[str], compact: bool = False) -> Counter:
     """
     Devuelve un Counter con la frecuencia de cada token.
+    Con TokensCodificados devuelve un ConteoIds calculado sobre los ids (sin hashear cadenas).
+    Con compact=True devuelve una TablaFrecuencias (arrays ordenados,
+    fusionable y serializable; ver tabla_frecuencias).
     """
-    return Counter(tokens)
+    if isinstance(tokens, TokensCodificados):
+        freqs = tokens.frecuencias()
+    else:
+        freqs = Counter(tokens)
+    return TablaFrecuencias.desde_conteo(freqs) if compact else freqs
+
+
+def count_frequencies_approx(tokens: Iterable[str], capacity: int = 10000) -> SpaceSaving:
+    """
+    Frecuencias aproximadas en memoria fija: el resultado guarda como mucho
+    `capacity` palabras y durante el conteo nunca hay más de 2 * capacity
+    (la tabla más el bloque de tokens que se está agregando).
+
+    Devuelve un SpaceSaving (misma API de lectura que Counter). Cada conteo
+    sobreestima el real en como mucho len(tokens) / capacity y toda palabra
+    más frecuente que esa cota aparece (ver frecuencias_aprox).
+    """
+    sketch = SpaceSaving(capacity)
+    sketch.update(tokens)
+    return sketch
+
+
+# Ventana (en caracteres) en la que se busca con Punkt cada frontera de shard
+SHARD_WINDOW_CHARS = 4096
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _sentence_cut(text: str, target: int) -> int | None:
+    """
+    Primer inicio de frase de Punkt a partir de `target`, buscado solo en una
+    ventana de texto (que se agranda si no contiene ninguna frontera).
+
+    Punkt decide cada frontera mirando el token con el punto y el siguiente,
+    así que dentro de la ventana coincide con la del texto entero salvo en
+    sus extremos: la ventana empieza en un espacio (la primera "frase" es
+    artificial) y la última frase puede estar cortada; ninguna de las dos se usa.
+    """
+    m = _WHITESPACE.search(text, target)
+    if m is None:
+        return None
+    origin = m.start()
+    window = SHARD_WINDOW_CHARS
+    tokenizer = tokenizador_frases("spanish")
+    while True:
+        end = min(len(text), origin + window)
+        starts = [start for start, _ in tokenizer.span_tokenize(text[origin:end])]
+        usable = starts[1:] if end == len(text) else starts[1:-1]
+        if usable:
+            return origin + usable[0]
+        if end == len(text):
+            return None
+        window *= 2
+
+
+def _whitespace_cut(text: str, target: int) -> int | None:
+    """Inicio del primer token después de `target` (el backend regex no cruza espacios)."""
+    m = _WHITESPACE.search(text, target)
+    return m.end() if m and m.end() < len(text) else None
+
+
+def split_shards(text: str, n_shards: int, backend: str = "punkt") -> List[str]:
+    """
+    Parte el texto en ~n_shards trozos de tamaño parecido, de modo que
+    tokenizar por trozos da los mismos tokens que tokenizar el texto entero:
+    con 'punkt' cada corte es un inicio de frase de Punkt (buscado en una
+    ventana pequeña alrededor del corte, sin recorrer todo el texto); con
+    'regex' basta cortar en un espacio.
+    """
+    if n_shards <= 1 or not text:
+        return [text]
+    cut = _whitespace_cut if validar_backend(backend) == "regex" else _sentence_cut
+    size = max(1, len(text) // n_shards)
+    shards = []
+    start = 0
+    while start + size < len(text):
+        end = cut(text, start + size)
+        if end is None:
+            break
+        shards.append(text[start:end])
+        start = end
+    shards.append(text[start:])
+    return shards
+
+
+def tokenize_cached(
+    text: str,
+    cache: CacheTokens,
+    remove_stopwords: bool = False,
+    backend: str = "punkt"
+) -> List[str]:
+    """
+    Como tokenize_spanish (en minúsculas), pero consultando antes la caché.
+
+    En la caché se guardan los tokens sin quitar stopwords, así que analizar
+    el mismo texto con y sin stopwords solo tokeniza una vez: la eliminación
+    de stopwords se aplica sobre los tokens cacheados.
+    """
+    tokens = cache.obtener(
+        text,
+        ("tokenize_spanish", True, validar_backend(backend)),
+        lambda: tokenize_spanish(text, lowercase=True, remove_stopwords=False, backend=backend),
+    )
+    if remove_stopwords:
+        stops = stopwords_idioma("spanish")
+        return [t for t in tokens if t not in stops]
+    return list(tokens)
+
+
+def tokenize_encoded(
+    text: str,
+    vocabulary: Vocabulario,
+    remove_stopwords: bool = False,
+    backend: str = "punkt",
+    chunk_chars: int = 1 << 20,
+    profile: Perfil | None = None
+) -> TokensCodificados:
+    """
+    Como tokenize_spanish, pero devuelve los tokens internados como ids uint32
+    sobre `vocabulary`. El texto se procesa por trozos de ~chunk_chars, así
+    que nunca se tiene la lista completa de cadenas en memoria.
+    """
+    parts = []
+    for shard in split_shards(text, max(1, len(text) // chunk_chars), backend):
+        tokens = tokenize_spanish(shard, lowercase=True, remove_stopwords=remove_stopwords, backend=backend, profile=profile)
+        with etapa(profile, "encode", tokens) as e:
+            parts.append(vocabulary.codificar(tokens))
+            e.sumar_salidas(tokens)
+    ids = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint32)
+    return TokensCodificados(ids, vocabulary)
+
+
+def stem_tokens(tokens: List[str], stemmer: StemmerCacheado) -> List[str]:
+    """
+    Sustituye cada token por su raíz (Snowball memoizado, ver stemming).
+    Con TokensCodificados devuelve otro TokensCodificados sobre el mismo
+    vocabulario, haciendo stemming solo de los ids distintos.
+    """
+    if isinstance(tokens, TokensCodificados):
+        return TokensCodificados(stemmer.stem_ids(tokens.ids, tokens.vocabulario), tokens.vocabulario)
+    return stemmer.stem_tokens(tokens)
+
+
+def _count_shard(shard: str, remove_stopwords: bool, backend: str = "punkt", compact: bool = False) -> Counter:
+    """Tarea del pool de procesos: tokeniza y cuenta un trozo del texto."""
+    return count_frequencies(
+        tokenize_spanish(shard, lowercase=True, remove_stopwords=remove_stopwords, backend=backend),
+        compact=compact,
+    )
+
+
+def merge_counters(counters: List[Counter]) -> Counter:
+    """
+    Fusiona Counters por parejas (en árbol), volcando siempre el menor en el
+    mayor, de modo que cada nivel recorre como mucho el vocabulario total.
+
+    Para no copiarlos, los Counters recibidos se reutilizan y quedan
+    modificados: si se necesitan después, pasa copias.
+    """
+    counters = list(counters)
+    if not counters:
+        return Counter()
+    while len(counters) > 1:
+        merged = []
+        for a, b in zip(counters[::2], counters[1::2]):
+            if len(a) < len(b):
+                a, b = b, a
+            a.update(b)
+            merged.append(a)
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    return counters[0]
+
+
+def count_frequencies_parallel(
+    text: str,
+    workers: int,
+    remove_stopwords: bool = False,
+    shards_per_worker: int = 4,
+    backend: str = "punkt",
+    compact: bool = False
+) -> Counter:
+    """
+    Cuenta frecuencias usando un pool de `workers` procesos.
+
+    El texto se divide en shards por oraciones (varios por worker para
+    repartir mejor la carga), cada shard se tokeniza y cuenta en un proceso
+    y los Counters parciales se fusionan con merge_counters.
+
+    Con compact=True cada proceso devuelve una TablaFrecuencias (mucho más
+    barata de serializar entre procesos que un Counter) y se fusionan con
+    fusionar_tablas.
+    """
+    ensure_nltk_data()
+    count = partial(_count_shard, remove_stopwords=remove_stopwords, backend=backend, compact=compact)
+    if workers <= 1:
+        return count(text)
+    shards = split_shards(text, workers * shards_per_worker, backend)
+    merge = fusionar_tablas if compact else merge_counters
+    if len(shards) == 1:
+        return merge([count(s) for s in shards])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = list(executor.map(count, shards))
+    return merge(partials)
 
 
 def top_n_words(freqs: Counter, n: int = 5) -> List[Tuple[str, int]]:
     """
     Devuelve las n palabras más frecuentes como lista de (palabra, frecuencia).
+    Acepta Counter, FreqDist, SpaceSaving, ConteoIds o TablaFrecuencias.
     """
     return freqs.most_common(n)
 
 
+def _frequency_values(freqs, dtype=np.int64) -> np.ndarray:
+    """Frecuencias como array de NumPy, sin pasar por listas intermedias."""
+    values = freqs.values()
+    if isinstance(values, np.ndarray):
+        return values.astype(dtype, copy=False)
+    return np.fromiter(values, dtype=dtype, count=len(values))
+
+
 def compute_stats(freqs: Counter) -> Dict[str, float]:
     """
     Calcula estadísticas simples sobre las frecuencias usando SciPy/Numpy:
@@ -93,8 +336,14 @@ def compute_stats(freqs: Counter) -> Dict[str, float]:
     - mean_z_abs: media del valor absoluto del z-score (si aplica)
 
     Nota: si hay 1 sola palabra distinta, z-score no aplica.
+    Acepta Counter, FreqDist, SpaceSaving, ConteoIds (sin decodificar ids) o
+    TablaFrecuencias.
+    Para corpus que crecen, estadisticas.EstadisticasIncrementales da los mismos
+    campos actualizando solo las palabras que cambian, y
+    estadisticas.estadisticas_por_fila los calcula para todas las filas de una
+    matriz documento-término a la vez.
     """
-    counts = np.array(list(freqs.values()), dtype=float)
+    counts = _frequency_values(freqs, dtype=float)
     total = counts.sum()
     vocab = len(counts)
     if total == 0:
@@ -128,21 +377,218 @@ def compute_stats(freqs: Counter) -> Dict[str, float]:
 def analyze_text(
     text: str,
     remove_stopwords: bool = False,
-    top_n: int = 5
+    top_n: int = 5,
+    workers: int = 1,
+    backend: str = "punkt",
+    sketch_capacity: int | None = None,
+    vocabulary: Vocabulario | None = None,
+    cache: CacheTokens | None = None,
+    ngrams: bool = False,
+    ngram_max_entries: int = 1_000_000,
+    instrumentation: Instrumentacion | None = None,
+    compact: bool = False,
+    stemmer: StemmerCacheado | None = None
 ) -> Dict[str, object]:
     """
     Pipeline completo: tokeniza, cuenta frecuencias, calcula top-N y estadísticas.
+
+    Con workers > 1 el conteo se reparte en un pool de procesos
+    (count_frequencies_parallel); en ese caso los tokens no se devuelven
+    ("tokens" es None) porque nunca llegan al proceso principal, y
+    sketch_capacity, vocabulary, cache y ngrams dan ValueError.
+
+    Con sketch_capacity, "frequencies" es un SpaceSaving de esa capacidad
+    (count_frequencies_approx): el top es aproximado, total_tokens es exacto
+    y el resto de estadísticas se calculan sobre las palabras monitorizadas.
+
+    Con vocabulary (p. ej. Vocabulario() compartido entre documentos), "tokens"
+    es un TokensCodificados (ids uint32) y "frequencies" un ConteoIds.
+
+    Con cache (CacheTokens), la tokenización se reutiliza entre llamadas con
+    el mismo texto y backend (ver tokenize_cached).
+
+    Con ngrams=True se añaden "ngrams" (top de bigramas y trigramas) y
+    "collocations" (bigramas por PMI y log-likelihood), contados sobre el
+    mismo flujo de tokens con tablas de como mucho ngram_max_entries.
+
+    Con compact=True (y sin sketch_capacity) "frequencies" es una
+    TablaFrecuencias.
+
+    Con stemmer (StemmerCacheado, conviene compartirlo entre llamadas para
+    reutilizar su caché) se cuentan raíces en lugar de palabras, después de
+    quitar stopwords; "stemming" trae las estadísticas de aciertos de la
+    caché. Con workers > 1 el stemming se aplica a las frecuencias ya
+    fusionadas (una vez por palabra distinta).
+
+    Con instrumentation (instrumentacion.Instrumentacion) se mide cada etapa
+    (punkt/regex, lowercase, isalpha, stopwords, count, top, stats...):
+    tiempo de reloj, de CPU y elementos de entrada y salida. El perfil se
+    publica en los sumideros configurados y se devuelve en "profile". Sin
+    ella no se mide nada.
     """
-    tokens = tokenize_spanish(text, lowercase=True, remove_stopwords=remove_stopwords)
-    freqs = count_frequencies(tokens)
-    top = top_n_words(freqs, n=top_n)
-    stats = compute_stats(freqs)
-    return {
+    profile = instrumentation.nuevo_perfil("analyze_text") if instrumentation is not None else None
+    if workers > 1:
+        if sketch_capacity or ngrams or cache is not None or vocabulary is not None:
+            raise ValueError("sketch_capacity, ngrams, cache y vocabulary no son compatibles con workers > 1")
+        tokens = None
+        with etapa(profile, "count_parallel", text) as e:
+            freqs = count_frequencies_parallel(
+                text, workers, remove_stopwords=remove_stopwords, backend=backend, compact=compact
+            )
+            e.sumar_salidas(freqs)
+        if stemmer is not None:
+            with etapa(profile, "stem", freqs) as e:
+                freqs = stemmer.stem_conteo(freqs)
+                if compact:
+                    freqs = TablaFrecuencias.desde_conteo(freqs)
+                e.sumar_salidas(freqs)
+    else:
+        if cache is not None:
+            with etapa(profile, "cache", text) as e:
+                tokens = tokenize_cached(text, cache, remove_stopwords=remove_stopwords, backend=backend)
+                e.sumar_salidas(tokens)
+            if vocabulary is not None:
+                with etapa(profile, "encode", tokens) as e:
+                    tokens = TokensCodificados(vocabulary.codificar(tokens), vocabulary)
+                    e.sumar_salidas(tokens)
+        elif vocabulary is not None:
+            tokens = tokenize_encoded(text, vocabulary, remove_stopwords=remove_stopwords, backend=backend, profile=profile)
+        else:
+            tokens = tokenize_spanish(
+                text, lowercase=True, remove_stopwords=remove_stopwords, backend=backend, profile=profile
+            )
+        if stemmer is not None:
+            with etapa(profile, "stem", tokens) as e:
+                tokens = stem_tokens(tokens, stemmer)
+                e.sumar_salidas(tokens)
+        with etapa(profile, "count", tokens) as e:
+            if sketch_capacity:
+                freqs = count_frequencies_approx(tokens, sketch_capacity)
+            else:
+                freqs = count_frequencies(tokens, compact=compact)
+            e.sumar_salidas(freqs)
+    with etapa(profile, "top", freqs) as e:
+        top = top_n_words(freqs, n=top_n)
+        e.sumar_salidas(top)
+    with etapa(profile, "stats", freqs) as e:
+        stats = compute_stats(freqs)
+        e.sumar_salidas(stats)
+    result = {
         "tokens": tokens,
         "frequencies": freqs,
         "top": top,
         "stats": stats,
     }
+    if ngrams:
+        with etapa(profile, "ngrams", tokens) as e:
+            counter = ContadorNGramas(n_max=3, max_entradas=ngram_max_entries)
+            counter.update(tokens)
+            result["ngrams"] = {"bigrams": counter.top(2, top_n), "trigrams": counter.top(3, top_n)}
+            result["collocations"] = counter.colocaciones(k=top_n)
+            e.sumar_salidas(counter)
+    if stemmer is not None:
+        result["stemming"] = stemmer.estadisticas()
+    if profile is not None:
+        result["profile"] = profile
+        instrumentation.publicar(profile)
+    return result
+
+
+# Tamaño aproximado (en caracteres) de cada bloque leído de un archivo del corpus
+DEFAULT_CHUNK_CHARS = 1 << 20
+
+
+def iter_corpus_files(source: str) -> Iterator[str]:
+    """
+    Devuelve las rutas de los archivos de texto de un corpus.
+
+    - Si `source` es un directorio, recorre recursivamente sus archivos .txt
+    - Si no, se interpreta como patrón glob (admite '**')
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".txt"):
+                    yield os.path.join(root, name)
+    else:
+        for path in sorted(glob.iglob(source, recursive=True)):
+            if os.path.isfile(path):
+                yield path
+
+
+def iter_text_chunks(path: str, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Lee un archivo de texto por bloques de ~chunk_chars caracteres.
+
+    Cada bloque se corta en el último espacio en blanco para no partir palabras,
+    así nunca se tiene el archivo completo en memoria.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        pending = ""
+        while True:
+            block = f.read(chunk_chars)
+            if not block:
+                break
+            block = pending + block
+            cut = max(block.rfind(" "), block.rfind("\n"), block.rfind("\t"))
+            if cut <= 0:
+                pending = block
+                continue
+            pending = block[cut:]
+            yield block[:cut]
+        if pending.strip():
+            yield pending
+
+
+def count_file(
+    path: str,
+    remove_stopwords: bool = False,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    backend: str = "punkt"
+) -> Counter:
+    """
+    Tokeniza un archivo bloque a bloque con tokenize_spanish y devuelve su Counter.
+    """
+    freqs: Counter = Counter()
+    for chunk in iter_text_chunks(path, chunk_chars):
+        freqs.update(tokenize_spanish(chunk, lowercase=True, remove_stopwords=remove_stopwords, backend=backend))
+    return freqs
+
+
+def analyze_corpus(
+    source: str,
+    remove_stopwords: bool = False,
+    top_n: int = 5,
+    max_workers: int = 4,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    backend: str = "punkt"
+) -> Dict[str, object]:
+    """
+    Analiza un corpus (directorio o patrón glob de archivos de texto).
+
+    Los archivos se leen en un pool de hilos acotado: como mucho hay
+    2 * max_workers archivos en vuelo, cada uno leído por bloques de
+    chunk_chars, así que la memoria pico depende del número de workers
+    (más el vocabulario global), no del tamaño del corpus.
+
+    A diferencia de analyze_text no se devuelven los tokens; "frequencies"
+    es un Counter global compatible con top_n_words y compute_stats.
+    """
+    ensure_nltk_data()
+    freqs: Counter = Counter()
+    n_files = 0
+    count = partial(count_file, remove_stopwords=remove_stopwords, chunk_chars=chunk_chars, backend=backend)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for file_freqs in map_acotado(executor, count, iter_corpus_files(source), 2 * max_workers):
+            freqs.update(file_freqs)
+            n_files += 1
+    return {
+        "files": n_files,
+        "frequencies": freqs,
+        "top": top_n_words(freqs, n=top_n),
+        "stats": compute_stats(freqs),
+    }
 
 
 def print_report(title: str, result: Dict[str, object]) -> None:
@@ -161,19 +607,103 @@ def print_report(title: str, result: Dict[str, object]) -> None:
     print(f"  - mean_freq:    {s['mean_freq']:.4f}")
     print(f"  - std_freq:     {s['std_freq']:.4f}")
     print(f"  - mean_z_abs:   {s['mean_z_abs']:.4f}")
+    if "ngrams" in result:
+        print("Bigramas y trigramas más frecuentes:")
+        for g, c in result["ngrams"]["bigrams"] + result["ngrams"]["trigrams"]:
+            print(f"  - {' '.join(g)}: {c}")
+        print("Colocaciones (log-likelihood):")
+        for g, score in result["collocations"]["log_likelihood"]:
+            print(f"  - {' '.join(g)}: {score:.2f}")
+
+
+def plot_top_words_bar(
+    top: Iterable[Tuple[str, int]] | Counter,
+    title: str = "Top palabras",
+    n: int = 10,
+    show: bool = True,
+):
+    """
+    Gráfico de barras horizontales de las palabras más frecuentes.
+
+    `top` puede ser una lista de (palabra, frecuencia) ya calculada (como
+    result["top"]) o cualquier fuente de frecuencias (Counter, FreqDist,
+    SpaceSaving, ConteoIds); en ese caso solo se piden sus n primeras con
+    most_common(n), que usa un heap y no copia ni ordena la tabla entera.
+    Devuelve la figura.
+    """
+    if hasattr(top, "most_common"):
+        top = top.most_common(n)
+    top = list(top)[:n]
+    fig, ax = plt.subplots(figsize=(10, max(3, 0.4 * len(top) + 1)))
+    if top:
+        words, counts = zip(*top)
+        # La más frecuente arriba
+        ax.barh(words[::-1], counts[::-1], color="#4C72B0")
+        for y, c in enumerate(counts[::-1]):
+            ax.text(c, y, f" {c}", va="center")
+    else:
+        ax.text(0.5, 0.5, "Sin datos", ha="center", va="center", transform=ax.transAxes)
+    ax.set_title(title)
+    ax.set_xlabel("Frecuencia")
+    fig.tight_layout()
+    if show:
+        plt.show()
+    return fig
+
+
+def plot_freq_histogram(
+    freqs: Counter,
+    title: str = "Distribución de frecuencias",
+    bins: int = 40,
+    show: bool = True,
+):
+    """
+    Histograma de las frecuencias de palabra (cuántas palabras aparecen 1, 2,
+    3... veces) con intervalos logarítmicos y ambos ejes en escala log, la
+    forma legible de una distribución tipo Zipf.
+
+    Las frecuencias se pasan a un array de NumPy y se agrupan con
+    np.histogram; solo se dibujan los `bins` intervalos, nunca una barra por
+    palabra, así que un vocabulario de millones de palabras se dibuja en
+    menos de un segundo. Devuelve la figura.
+    """
+    counts = _frequency_values(freqs)
+    fig, ax = plt.subplots(figsize=(10, 5))
+    if counts.size:
+        top = int(counts.max())
+        # Bordes enteros crecientes: los primeros intervalos son 1, 2, 3...
+        edges = np.unique(np.geomspace(1, top + 1, num=bins + 1).round().astype(np.int64))
+        if edges.size < 2:
+            edges = np.array([1, top + 1])
+        hist, edges = np.histogram(counts, bins=edges)
+        ax.stairs(hist, edges, fill=True, color="#4C72B0", alpha=0.8)
+        ax.set_xscale("log")
+        if hist.any():
+            ax.set_yscale("log")
+    else:
+        ax.text(0.5, 0.5, "Sin datos", ha="center", va="center", transform=ax.transAxes)
+    ax.set_title(title)
+    ax.set_xlabel("Frecuencia de la palabra (escala log)")
+    ax.set_ylabel("Número de palabras")
+    fig.tight_layout()
+    if show:
+        plt.show()
+    return fig
 
 
 if __name__ == "__main__":
     # Ejemplo 1: texto del enunciado
     text = "Python es genial. Me encanta Python porque Python es fácil."
-    result_all = analyze_text(text, remove_stopwords=False, top_n=5)
+    # La caché evita tokenizar dos veces el mismo texto en los dos análisis
+    cache = CacheTokens()
+    result_all = analyze_text(text, remove_stopwords=False, top_n=5, cache=cache)
     print_report("Texto de ejemplo (sin eliminar stopwords)", result_all)
     # Gráficos claros y presentables
     plot_top_words_bar(result_all["top"], title="Top 5 palabras (sin eliminar stopwords)")
     plot_freq_histogram(result_all["frequencies"], title="Distribución de frecuencias (sin eliminar stopwords)")
 
     # Si quieres ver el efecto de eliminar stopwords:
-    result_nostop = analyze_text(text, remove_stopwords=True, top_n=5)
+    result_nostop = analyze_text(text, remove_stopwords=True, top_n=5, cache=cache)
     print_report("Texto de ejemplo (eliminando stopwords)", result_nostop)
     plot_top_words_bar(result_nostop["top"], title="Top 5 palabras (eliminando stopwords)")
     plot_freq_histogram(result_nostop["frequencies"], title="Distribución de frecuencias (eliminando stopwords)")
@@ -182,12 +712,16 @@ if __name__ == "__main__":
     # Opciones:
     #  A) Pega el texto directamente en article_text
     #  B) O lee desde un archivo de texto plano
+    #  C) O analiza un corpus: un directorio o un patrón glob (p. ej. "articulos/**/*.txt")
     article_text = None  # Reemplaza con tu texto si quieres probar en línea
 
     file_path = "ruta/a/tu_articulo.txt"  # Cambia esta ruta si quieres leer de archivo
     if article_text:
         result_article = analyze_text(article_text, remove_stopwords=True, top_n=5)
         print_report("Artículo (cadena en código, con stopwords eliminadas)", result_article)
+    elif os.path.isdir(file_path) or glob.has_magic(file_path):
+        result_corpus = analyze_corpus(file_path, remove_stopwords=True, top_n=5)
+        print_report(f"Corpus: {file_path} ({result_corpus['files']} archivos)", result_corpus)
     elif os.path.isfile(file_path):
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
@@ -3,6 +3,7 @@
 Ejercicio 3 (+ Ejercicio 1 integrado en este archivo)
 
 - Función limpiar_texto(texto): minúsculas, tokenización, quitar stopwords y puntuación.
+- Función limpiar_textos(textos): lo mismo para muchos textos, preparando todo una sola vez.
 - Demostración Ejercicio 1: escribir un texto de 3 oraciones y tokenizar en frases y palabras.
 
 Requisitos: nltk
@@ -11,26 +12,31 @@ Este script intenta descargar automáticamente los recursos necesarios (punkt, s
 from __future__ import annotations
 
 import string
-from typing import List, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import FrozenSet, List, Iterable, Iterator
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from paralelo import en_lotes, map_acotado
+from recursos_nltk import asegurar_recursos, asegurar_tokenizador, stopwords_con_extra
+from tokenizacion import frases_punkt, palabras_punkt, tokenizar, validar_backend
+
+
+# Conjunto de puntuación ampliado para español
+PUNTUACION = frozenset(string.punctuation) | {'¿', '¡', '…', '«', '»', '–', '—', '“', '”', '’', '´', '`', '·'}
 
 
 def _ensure_nltk_resources() -> None:
-    """Garantiza que los recursos necesarios de NLTK estén disponibles."""
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords', quiet=True)
-
-
-def limpiar_texto(texto: str, idioma: str = 'spanish', stopwords_extra: Iterable[str] | None = None) -> List[str]:
+    """Garantiza que los recursos necesarios de NLTK estén disponibles (una vez por proceso)."""
+    asegurar_tokenizador()
+    asegurar_recursos('stopwords')
+
+
+def limpiar_texto(
+    texto: str,
+    idioma: str = 'spanish',
+    stopwords_extra: Iterable[str] | None = None,
+    backend: str = 'punkt',
+) -> List[str]:
     """
     Limpia un texto: minúsculas, tokenización, quitar stopwords y puntuación.
 
@@ -38,6 +44,7 @@ def limpiar_texto(texto: str, idioma: str = 'spanish', stopwords_extra: Iterable
         texto: Texto de entrada.
         idioma: Idioma para las stopwords de NLTK (por defecto 'spanish').
         stopwords_extra: Colección opcional de palabras a eliminar además de las stopwords.
+        backend: Tokenizador de palabras: 'punkt' (NLTK) o 'regex' (ver tokenizacion).
 
     Returns:
         Lista de tokens limpios (palabras).
@@ -45,25 +52,62 @@ def limpiar_texto(texto: str, idioma: str = 'spanish', stopwords_extra: Iterable
     if not isinstance(texto, str) or not texto.strip():
         return []
 
-    _ensure_nltk_resources()
+    if validar_backend(backend) == 'punkt':
+        _ensure_nltk_resources()
+
+    return _limpiar(texto, stopwords_con_extra(idioma, stopwords_extra), backend)
+
+
+def _limpiar(texto: str, stops: FrozenSet[str], backend: str) -> List[str]:
+    """Núcleo de limpiar_texto, con stopwords y backend ya preparados."""
+    if not isinstance(texto, str) or not texto.strip():
+        return []
 
     # 1) Minúsculas
     texto = texto.lower()
 
     # 2) Tokenización en palabras (usando modelo 'spanish')
-    tokens = word_tokenize(texto, language='spanish')
+    tokens = tokenizar(texto, backend)
+
+    # 3) Filtrado final: sin stopwords, sin puntuación, sin dígitos puros
+    return [t for t in tokens if t not in stops and t not in PUNTUACION and not t.isdigit()]
+
+
+def _limpiar_lote(textos: List[str], stops: FrozenSet[str], backend: str) -> List[List[str]]:
+    """Tarea del pool de procesos: limpia un lote de textos."""
+    return [_limpiar(t, stops, backend) for t in textos]
 
-    # 3) Stopwords y puntuación
-    stops = set(stopwords.words(idioma))
-    if stopwords_extra:
-        stops.update(map(str.lower, stopwords_extra))
 
-    # Conjunto de puntuación ampliado para español
-    puntuacion = set(string.punctuation) | {'¿', '¡', '…', '«', '»', '–', '—', '“', '”', '’', '´', '`', '·'}
+def limpiar_textos(
+    textos: Iterable[str],
+    idioma: str = 'spanish',
+    stopwords_extra: Iterable[str] | None = None,
+    workers: int = 1,
+    backend: str = 'punkt',
+    lote: int = 256,
+) -> Iterator[List[str]]:
+    """
+    Versión por lotes de limpiar_texto: genera la lista de tokens limpios de
+    cada texto, en el mismo orden de entrada y de forma perezosa.
+
+    Recursos, stopwords y puntuación se preparan una sola vez. Con workers > 1
+    los textos se agrupan en lotes de `lote` y se limpian en un pool de
+    procesos, con como mucho 2 * workers lotes en vuelo, así que el iterable
+    puede ser un flujo de millones de comentarios.
+    """
+    if validar_backend(backend) == 'punkt':
+        _ensure_nltk_resources()
+    stops = stopwords_con_extra(idioma, stopwords_extra)
+
+    if workers <= 1:
+        for texto in textos:
+            yield _limpiar(texto, stops, backend)
+        return
 
-    # Filtrado final: sin stopwords, sin puntuación, sin dígitos puros
-    tokens_limpios = [t for t in tokens if t not in stops and t not in puntuacion and not t.isdigit()]
-    return tokens_limpios
+    tarea = partial(_limpiar_lote, stops=stops, backend=backend)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for limpios in map_acotado(executor, tarea, en_lotes(textos, lote), 2 * workers):
+            yield from limpios
 
 
 if __name__ == '__main__':
@@ -83,13 +127,13 @@ if __name__ == '__main__':
     print(texto_3_oraciones)
 
     # Tokenización en frases (español)
-    frases = sent_tokenize(texto_3_oraciones, language='spanish')
+    frases = frases_punkt(texto_3_oraciones, 'spanish')
     print("\nFrases:")
     for i, f in enumerate(frases, start=1):
         print(f"{i}. {f}")
 
     # Tokenización en palabras (sobre todo el texto)
-    palabras = word_tokenize(texto_3_oraciones, language='spanish')
+    palabras = palabras_punkt(texto_3_oraciones, 'spanish')
     print("\nPalabras:")
     print(palabras)
 
@@ -1,63 +1,128 @@
 
 import matplotlib.pyplot as plt
 import string
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 from nltk.probability import FreqDist
 from collections import Counter
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
-# Descargar recursos necesarios
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+from deduplicacion import DeduplicadorMinHash, filtrar_casi_duplicados
+from frecuencias_aprox import SpaceSaving
+from recursos_nltk import STOPWORDS_REDES, asegurar_recursos, asegurar_tokenizador, stopwords_idioma
+from stemming import StemmerCacheado
+from tabla_frecuencias import TablaFrecuencias
+from tokenizacion import palabras_punkt
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Recursos de NLTK (paquete local si existe; si no, nltk_data)
+asegurar_tokenizador()
+asegurar_recursos('stopwords')
 
-def limpiar_y_analizar_comentarios(comentarios: List[str]) -> Dict:
+def filtrar_tokens(tokens: List[str], stop_words) -> List[str]:
     """
-    Limpia y analiza una lista de comentarios de redes sociales
+    Reglas de limpieza de comentarios: sin stopwords, sin puntuación,
+    sin palabras muy cortas (<= 2 letras) y solo tokens alfabéticos.
+    """
+    return [w for w in tokens if w not in stop_words 
+            and w not in string.punctuation 
+            and len(w) > 2 
+            and w.isalpha()]
+
+def limpiar_comentario(comentario: str) -> List[str]:
+    """
+    Limpia un solo comentario con las mismas reglas que limpiar_y_analizar_comentarios
     
     Args:
-        comentarios (List[str]): Lista de comentarios a analizar
+        comentario (str): Texto del comentario
         
     Returns:
-        Dict: Diccionario con resultados del análisis
+        List[str]: Tokens limpios del comentario
     """
-    # Obtener stopwords en español
-    stop_words = set(stopwords.words('spanish'))
-    
-    # Agregar palabras comunes de redes sociales a stopwords
-    stop_words_extra = {'jaja', 'jeje', 'jiji', 'wow', 'omg', 'xd', 'lol', 'rt', 'dm', 'like', 'follow'}
-    stop_words.update(stop_words_extra)
-    
-    # Combinar todos los comentarios
-    texto_completo = ' '.join(comentarios)
-    
-    # Tokenización
-    tokens = word_tokenize(texto_completo.lower())
-    
-    # Limpiar tokens (eliminar stopwords, puntuación y palabras muy cortas)
-    tokens_limpios = [w for w in tokens if w not in stop_words 
-                     and w not in string.punctuation 
-                     and len(w) > 2 
-                     and w.isalpha()]
+    stop_words = stopwords_idioma('spanish', STOPWORDS_REDES)
+    return filtrar_tokens(palabras_punkt(comentario.lower(), 'english'), stop_words)
+
+def limpiar_y_analizar_comentarios(comentarios: Iterable[str], capacidad_sketch: Optional[int] = None,
+                                   deduplicar: bool = False, umbral_duplicado: float = 0.8,
+                                   compacta: bool = False, stemmer: Optional[StemmerCacheado] = None) -> Dict:
+    """
+    Limpia y analiza comentarios de redes sociales
     
-    # Calcular frecuencias
-    fdist = FreqDist(tokens_limpios)
+    Los comentarios se procesan de uno en uno y nunca se unen en un solo
+    texto, así que `comentarios` puede ser un generador o un flujo de
+    millones de comentarios. En la misma pasada se cuentan la frecuencia de
+    cada palabra (veces que aparece) y su frecuencia de documento (en
+    cuántos comentarios aparece).
     
-    return {
-        'tokens_originales': len(tokens),
-        'tokens_limpios': len(tokens_limpios),
+    Args:
+        comentarios (Iterable[str]): Comentarios a analizar
+        capacidad_sketch (Optional[int]): Si se indica, las frecuencias se cuentan
+            con un SpaceSaving de esa capacidad (memoria fija, top aproximado)
+            en lugar de un FreqDist; 'palabras_unicas' son entonces las
+            palabras monitorizadas
+        deduplicar (bool): Si es True, los comentarios casi duplicados (spam,
+            copias, retuits) se agrupan con MinHash + LSH y cada grupo se
+            cuenta una sola vez (el primer comentario de cada grupo)
+        umbral_duplicado (float): Jaccard estimado a partir del cual dos
+            comentarios se consideran el mismo
+        compacta (bool): Si es True, 'fdist' y 'df' se devuelven como
+            TablaFrecuencias (compactas, fusionables entre lotes y guardables
+            con .guardar())
+        stemmer (Optional[StemmerCacheado]): Si se indica, se cuentan raíces
+            ('excelente', 'excelentes' -> 'excelent') con un stemmer Snowball
+            memoizado; 'stemming' trae sus aciertos de caché
+        
+    Returns:
+        Dict: Diccionario con resultados del análisis ('fdist' y 'top_palabras'
+        por frecuencia; 'df' y 'top_df' por número de comentarios)
+    """
+    # Stopwords en español + palabras comunes de redes sociales (cacheadas por proceso)
+    stop_words = stopwords_idioma('spanish', STOPWORDS_REDES)
+    
+    # Quitar casi duplicados antes de contar (también de forma perezosa)
+    if deduplicar:
+        deduplicador = DeduplicadorMinHash(umbral=umbral_duplicado)
+        comentarios = filtrar_casi_duplicados(comentarios, deduplicador)
+    
+    # Frecuencia de término y de documento
+    if capacidad_sketch:
+        fdist = SpaceSaving(capacidad_sketch)
+        df = SpaceSaving(capacidad_sketch)
+    else:
+        fdist = FreqDist()
+        df = FreqDist()
+    
+    n_comentarios = n_tokens = n_limpios = 0
+    for comentario in comentarios:
+        # Tokenización (modelo Punkt inglés, el de word_tokenize por defecto)
+        tokens = palabras_punkt(comentario.lower(), 'english')
+        # Limpiar tokens (eliminar stopwords, puntuación y palabras muy cortas)
+        limpios = filtrar_tokens(tokens, stop_words)
+        if stemmer is not None:
+            limpios = stemmer.stem_tokens(limpios)
+        fdist.update(limpios)
+        df.update(set(limpios))
+        n_comentarios += 1
+        n_tokens += len(tokens)
+        n_limpios += len(limpios)
+    
+    if compacta:
+        fdist = TablaFrecuencias.desde_conteo(fdist)
+        df = TablaFrecuencias.desde_conteo(df)
+    
+    resultados = {
+        'comentarios': n_comentarios,
+        'tokens_originales': n_tokens,
+        'tokens_limpios': n_limpios,
         'palabras_unicas': len(fdist),
         'fdist': fdist,
-        'top_palabras': fdist.most_common(10)
+        'top_palabras': fdist.most_common(10),
+        'df': df,
+        'top_df': df.most_common(10)
     }
+    if stemmer is not None:
+        resultados['stemming'] = stemmer.estadisticas()
+    if deduplicar:
+        resultados['comentarios_totales'] = deduplicador.total
+        resultados['comentarios_unicos'] = deduplicador.grupos
+    return resultados
 
 def crear_grafico_comentarios(top_palabras, titulo="Palabras Más Repetidas"):
     """
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Estadísticas de frecuencias incrementales y fusionables.
+
+EstadisticasIncrementales devuelve los mismos seis campos que
+compute_stats (ejercicio2.py), pero se actualiza con deltas de frecuencia
+en O(palabras cambiadas) en lugar de recalcular todo desde cero. Para ello
+mantiene, además de los conteos por palabra:
+
+  - N = suma de conteos y S2 = suma de conteos al cuadrado (enteros exactos)
+  - sum(c * log2 c), con lo que entropía = log2 N - sum(c log2 c) / N
+  - cuántas palabras tienen cada conteo (frecuencia de frecuencias), con lo
+    que mean_z_abs se obtiene recorriendo solo los conteos distintos, que en
+    un texto real (ley de Zipf) son muy pocos comparados con el vocabulario
+
+Dos acumuladores (de otros workers o de otros días) se combinan con fusionar.
+
+estadisticas_por_fila calcula los mismos seis campos para todas las filas
+de una matriz documento-término dispersa a la vez (p. ej. la de
+tfidf.matriz_desde_corpus), con np.bincount sobre los elementos no nulos y
+sin bucle de Python por documento.
+"""
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Dict, Mapping
+
+import numpy as np
+from scipy import sparse
+
+
+def _clog2c(c: int) -> float:
+    return c * math.log2(c) if c > 0 else 0.0
+
+
+class EstadisticasIncrementales:
+    """Acumulador de estadísticas de frecuencias que admite deltas y fusión."""
+
+    def __init__(self, freqs: Mapping[str, int] | None = None):
+        self.conteos: Counter = Counter()
+        self.total = 0
+        self._suma_cuadrados = 0
+        self._suma_clog2c = 0.0
+        self._frec_de_frec: Counter = Counter()
+        if freqs:
+            self.actualizar(freqs)
+
+    def actualizar(self, deltas: Mapping[str, int]) -> "EstadisticasIncrementales":
+        """
+        Suma los deltas (pueden ser negativos) a los conteos. Coste
+        proporcional al número de palabras de `deltas`.
+        """
+        conteos = self.conteos
+        fdf = self._frec_de_frec
+        for palabra, delta in deltas.items():
+            if not delta:
+                continue
+            viejo = conteos.get(palabra, 0)
+            nuevo = viejo + delta
+            if nuevo < 0:
+                raise ValueError(f"el conteo de {palabra!r} quedaría negativo ({nuevo})")
+            self.total += delta
+            self._suma_cuadrados += nuevo * nuevo - viejo * viejo
+            self._suma_clog2c += _clog2c(nuevo) - _clog2c(viejo)
+            if viejo:
+                fdf[viejo] -= 1
+                if not fdf[viejo]:
+                    del fdf[viejo]
+            if nuevo:
+                fdf[nuevo] += 1
+                conteos[palabra] = nuevo
+            else:
+                del conteos[palabra]
+        return self
+
+    def fusionar(self, otro: "EstadisticasIncrementales") -> "EstadisticasIncrementales":
+        """Absorbe los conteos de otro acumulador (coste: vocabulario de `otro`)."""
+        return self.actualizar(otro.conteos)
+
+    def resultado(self) -> Dict[str, float]:
+        """Los seis campos de compute_stats para los conteos actuales."""
+        n = self.total
+        vocab = len(self.conteos)
+        if n == 0:
+            return {
+                "total_tokens": 0,
+                "vocab_size": 0,
+                "entropy_bits": 0.0,
+                "mean_freq": 0.0,
+                "std_freq": 0.0,
+                "mean_z_abs": 0.0,
+            }
+        media = n / vocab
+        # Varianza (ddof=0) exacta con enteros: (V * S2 - N^2) / V^2
+        num_var = vocab * self._suma_cuadrados - n * n
+        std = math.sqrt(num_var) / vocab
+        if vocab > 1:
+            if num_var == 0:
+                # Todas las palabras con el mismo conteo: scipy.stats.zscore da nan
+                mean_z_abs = float("nan")
+            else:
+                valores = np.fromiter(self._frec_de_frec.keys(), dtype=float, count=len(self._frec_de_frec))
+                palabras = np.fromiter(self._frec_de_frec.values(), dtype=float, count=len(self._frec_de_frec))
+                mean_z_abs = float(np.dot(np.abs(valores - media), palabras) / vocab / std)
+        else:
+            mean_z_abs = 0.0
+        return {
+            "total_tokens": int(n),
+            "vocab_size": int(vocab),
+            "entropy_bits": max(0.0, math.log2(n) - self._suma_clog2c / n),
+            "mean_freq": float(media),
+            "std_freq": float(std),
+            "mean_z_abs": mean_z_abs,
+        }
+
+
+def estadisticas_por_fila(matriz) -> Dict[str, np.ndarray]:
+    """
+    Los seis campos de compute_stats para cada fila de una matriz
+    documento-término (cualquier formato de scipy.sparse, o densa), como
+    tabla columnar: un array por campo con una posición por documento.
+
+    Solo cuentan los elementos positivos (los ceros explícitos no son parte
+    del vocabulario). Las filas vacías dan ceros, y mean_z_abs es nan si
+    todas las palabras de la fila tienen el mismo conteo, como con zscore.
+    """
+    m = sparse.csr_matrix(matriz)
+    n_filas = m.shape[0]
+    datos = m.data.astype(float)
+    filas = np.repeat(np.arange(n_filas), np.diff(m.indptr))
+    positivos = datos > 0
+    datos, filas = datos[positivos], filas[positivos]
+
+    total = np.bincount(filas, weights=datos, minlength=n_filas)
+    vocab = np.bincount(filas, minlength=n_filas)
+    con_datos = vocab > 0
+    media = np.divide(total, vocab, out=np.zeros(n_filas), where=con_datos)
+
+    # Dos pasadas, como np.std: desviaciones respecto a la media de su fila
+    desv = datos - media[filas]
+    std = np.sqrt(np.divide(np.bincount(filas, weights=desv * desv, minlength=n_filas), vocab,
+                            out=np.zeros(n_filas), where=con_datos))
+    suma_abs = np.bincount(filas, weights=np.abs(desv), minlength=n_filas)
+    mean_z_abs = np.zeros(n_filas)
+    con_z = vocab > 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_z_abs[con_z] = suma_abs[con_z] / vocab[con_z] / std[con_z]
+    mean_z_abs[con_z & (std == 0)] = np.nan
+
+    p = datos / total[filas]
+    entropia = np.maximum(-np.bincount(filas, weights=p * np.log2(p), minlength=n_filas), 0.0)
+    return {
+        "total_tokens": total.astype(np.int64),
+        "vocab_size": vocab.astype(np.int64),
+        "entropy_bits": entropia,
+        "mean_freq": media,
+        "std_freq": std,
+        "mean_z_abs": mean_z_abs,
+    }
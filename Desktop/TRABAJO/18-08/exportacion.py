@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación columnar (Parquet o Arrow IPC) de los resultados de análisis.
+
+EscritorColumnar recibe documentos de uno en uno (resultados de
+analyze_text o count_file) y escribe tres tablas en un directorio:
+
+- frecuencias: documento, palabra, frecuencia (una fila por palabra y documento)
+- top:         documento, rango, palabra, frecuencia
+- estadisticas: documento y los seis campos de compute_stats
+
+Las filas se acumulan como arrays de NumPy y se vuelcan en lotes de
+`filas_por_lote`, así que la memoria no crece con el corpus. Las columnas
+documento y palabra van codificadas como diccionario a partir de los ids de
+un Vocabulario compartido:
+- Parquet: cada lote lleva solo las palabras que usa (diccionario compacto
+  por grupo de filas)
+- Arrow: el diccionario es el vocabulario entero y cada lote solo emite las
+  palabras nuevas (dictionary deltas del formato IPC)
+
+Requisitos: pyarrow (opcional; solo lo necesita este módulo)
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping
+
+import numpy as np
+
+from paralelo import map_acotado
+from vocabulario import Vocabulario
+
+FORMATOS = ("parquet", "arrow")
+CAMPOS_ESTADISTICAS = ("total_tokens", "vocab_size", "entropy_bits", "mean_freq", "std_freq", "mean_z_abs")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("la exportación columnar necesita pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _esquemas(pa) -> Dict[str, "pa.Schema"]:
+    texto = pa.dictionary(pa.int32(), pa.string())
+    return {
+        "frecuencias": pa.schema([("documento", texto), ("palabra", texto), ("frecuencia", pa.int64())]),
+        "top": pa.schema([("documento", texto), ("rango", pa.uint16()), ("palabra", texto), ("frecuencia", pa.int64())]),
+        "estadisticas": pa.schema(
+            [("documento", texto)]
+            + [(c, pa.int64()) for c in CAMPOS_ESTADISTICAS[:2]]
+            + [(c, pa.float64()) for c in CAMPOS_ESTADISTICAS[2:]]
+        ),
+    }
+
+
+class EscritorColumnar:
+    """Escritura incremental de frecuencias, top-N y estadísticas por documento."""
+
+    def __init__(self, directorio: str, formato: str = "parquet", filas_por_lote: int = 1_000_000, compresion: str = "zstd"):
+        if formato not in FORMATOS:
+            raise ValueError(f"formato desconocido: {formato!r} (opciones: {', '.join(FORMATOS)})")
+        self._pa = pa = _pyarrow()
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.formato = formato
+        self.filas_por_lote = filas_por_lote
+        self.vocabulario = Vocabulario()
+        self.documentos: List[str] = []
+        self._esquemas = _esquemas(pa)
+        self._buffers: Dict[str, Dict[str, List[np.ndarray]]] = {
+            nombre: {campo: [] for campo in esquema.names} for nombre, esquema in self._esquemas.items()
+        }
+        self._filas = {nombre: 0 for nombre in self._esquemas}
+        # Diccionarios completos ya emitidos (solo Arrow): documento, palabra
+        self._diccionarios: Dict[str, "pa.Array"] = {}
+        self._escritores = {}
+        for nombre, esquema in self._esquemas.items():
+            ruta = self.ruta(nombre)
+            if formato == "parquet":
+                self._escritores[nombre] = pa.parquet.ParquetWriter(ruta, esquema, compression=compresion)
+            else:
+                opciones = pa.ipc.IpcWriteOptions(compression=compresion, emit_dictionary_deltas=True)
+                self._escritores[nombre] = pa.ipc.new_file(ruta, esquema, options=opciones)
+
+    def ruta(self, tabla: str) -> str:
+        return os.path.join(self.directorio, f"{tabla}.{self.formato}")
+
+    def agregar(self, documento: str, resultado: Mapping[str, object]) -> None:
+        """
+        Añade un documento. `resultado` es un dict con "frequencies" (Counter,
+        FreqDist, SpaceSaving o ConteoIds), "top" y "stats", como los de
+        analyze_text / analyze_corpus.
+        """
+        doc = len(self.documentos)
+        self.documentos.append(documento)
+        items = list(resultado["frequencies"].items())
+        ids = self.vocabulario.codificar(w for w, _ in items)
+        self._anadir("frecuencias", len(items), {
+            "documento": np.full(len(items), doc, dtype=np.int64),
+            "palabra": ids,
+            "frecuencia": np.fromiter((c for _, c in items), dtype=np.int64, count=len(items)),
+        })
+        top = list(resultado["top"])
+        self._anadir("top", len(top), {
+            "documento": np.full(len(top), doc, dtype=np.int64),
+            "rango": np.arange(1, len(top) + 1, dtype=np.uint16),
+            "palabra": self.vocabulario.codificar(w for w, _ in top),
+            "frecuencia": np.array([c for _, c in top], dtype=np.int64),
+        })
+        stats = resultado["stats"]
+        self._anadir("estadisticas", 1, {
+            "documento": np.array([doc], dtype=np.int64),
+            **{c: np.array([stats[c]]) for c in CAMPOS_ESTADISTICAS},
+        })
+
+    def _anadir(self, tabla: str, filas: int, columnas: Dict[str, np.ndarray]) -> None:
+        buffer = self._buffers[tabla]
+        for campo, valores in columnas.items():
+            buffer[campo].append(valores)
+        self._filas[tabla] += filas
+        if self._filas[tabla] >= self.filas_por_lote:
+            self._vaciar(tabla)
+
+    def _columna_texto(self, campo: str, ids: np.ndarray, valores: List[str]):
+        pa = self._pa
+        if self.formato == "parquet":
+            unicos, inversos = np.unique(ids, return_inverse=True)
+            return pa.DictionaryArray.from_arrays(
+                pa.array(inversos.astype(np.int32)), pa.array([valores[i] for i in unicos], pa.string())
+            )
+        # Arrow: el diccionario solo crece, así que el escritor emite deltas
+        previo = self._diccionarios.get(campo)
+        emitidos = 0 if previo is None else len(previo)
+        if emitidos < len(valores):
+            nuevos = pa.array(valores[emitidos:], pa.string())
+            previo = nuevos if previo is None else pa.concat_arrays([previo, nuevos])
+            self._diccionarios[campo] = previo
+        return pa.DictionaryArray.from_arrays(pa.array(ids.astype(np.int32)), previo)
+
+    def _vaciar(self, tabla: str) -> None:
+        if not self._filas[tabla]:
+            return
+        pa = self._pa
+        esquema = self._esquemas[tabla]
+        columnas = []
+        for campo in esquema.names:
+            valores = np.concatenate(self._buffers[tabla][campo])
+            if campo == "documento":
+                columnas.append(self._columna_texto(campo, valores, self.documentos))
+            elif campo == "palabra":
+                columnas.append(self._columna_texto(campo, valores, self.vocabulario.palabras))
+            else:
+                columnas.append(pa.array(valores, esquema.field(campo).type))
+            self._buffers[tabla][campo] = []
+        self._escritores[tabla].write_batch(pa.record_batch(columnas, schema=esquema))
+        self._filas[tabla] = 0
+
+    def cerrar(self) -> None:
+        """Vuelca lo pendiente y cierra los archivos (sin esto quedan incompletos)."""
+        for tabla, escritor in self._escritores.items():
+            self._vaciar(tabla)
+            escritor.close()
+        self._escritores = {}
+
+    def __enter__(self) -> "EscritorColumnar":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+def leer_tabla(ruta: str):
+    """Lee una tabla exportada (.parquet o .arrow) como pyarrow.Table."""
+    pa = _pyarrow()
+    if ruta.endswith(".arrow"):
+        with pa.ipc.open_file(ruta) as f:
+            return f.read_all()
+    return pa.parquet.read_table(ruta, read_dictionary=["documento", "palabra"])
+
+
+def exportar_corpus(
+    source: str,
+    directorio: str,
+    formato: str = "parquet",
+    remove_stopwords: bool = False,
+    top_n: int = 10,
+    backend: str = "punkt",
+    max_workers: int = 4,
+) -> int:
+    """
+    Cuenta cada archivo de `source` (directorio o glob) con count_file y lo
+    exporta en streaming: como mucho 2 * max_workers documentos contados
+    esperan en memoria. Devuelve el número de documentos.
+    """
+    from ejercicio2 import compute_stats, count_file, ensure_nltk_data, iter_corpus_files, top_n_words
+
+    ensure_nltk_data()
+    rutas = list(iter_corpus_files(source))
+
+    def analizar(ruta: str) -> Dict[str, object]:
+        freqs = count_file(ruta, remove_stopwords=remove_stopwords, backend=backend)
+        return {"frequencies": freqs, "top": top_n_words(freqs, top_n), "stats": compute_stats(freqs)}
+
+    with EscritorColumnar(directorio, formato) as escritor, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for ruta, resultado in zip(rutas, map_acotado(executor, analizar, rutas, 2 * max_workers)):
+            escritor.agregar(ruta, resultado)
+    return len(rutas)
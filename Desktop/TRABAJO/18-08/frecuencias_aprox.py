@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Frecuencias aproximadas en memoria fija (algoritmo Space-Saving).
+
+Space-Saving (Metwally, Agrawal y El Abbadi, 2005) monitoriza como mucho
+`capacidad` palabras. Cuando llega una palabra nueva con la tabla llena,
+sustituye a la de menor conteo y hereda ese conteo como error máximo.
+
+Cotas, con N = total de tokens vistos y k = capacidad:
+  - conteo(w) - error(w) <= real(w) <= conteo(w)
+  - error(w) <= N / k
+  - toda palabra con real(w) > N / k está monitorizada
+  - la suma de los conteos es exactamente N
+
+Memoria: la tabla guarda como mucho `capacidad` palabras; update agrega
+además bloques de como mucho `capacidad` tokens, así que en total nunca hay
+más de 2 * capacidad palabras en memoria.
+
+La API imita a Counter (most_common, values, items, len, []), de modo que
+top_n_words, compute_stats y los gráficos la aceptan sin cambios.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from itertools import islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+class SpaceSaving:
+    """Contador aproximado de heavy hitters con memoria acotada por `capacidad`."""
+
+    def __init__(self, capacidad: int = 10000):
+        if capacidad < 1:
+            raise ValueError("capacidad debe ser >= 1")
+        self.capacidad = capacidad
+        self.total = 0
+        self._conteos: Dict[Hashable, int] = {}
+        self._errores: Dict[Hashable, int] = {}
+        # Un (conteo, palabra) por palabra monitorizada. Los conteos solo crecen,
+        # así que una entrada con conteo viejo es una cota inferior: se corrige
+        # de forma perezosa al buscar el mínimo.
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def add(self, item: Hashable, n: int = 1) -> None:
+        """Suma n apariciones de item."""
+        self.total += n
+        conteos = self._conteos
+        if item in conteos:
+            conteos[item] += n
+            return
+        if len(conteos) < self.capacidad:
+            conteos[item] = n
+            self._errores[item] = 0
+            heapq.heappush(self._heap, (n, item))
+            return
+        heap = self._heap
+        while True:
+            minimo, victima = heap[0]
+            real = conteos[victima]
+            if real == minimo:
+                break
+            heapq.heapreplace(heap, (real, victima))
+        del conteos[victima]
+        del self._errores[victima]
+        conteos[item] = minimo + n
+        self._errores[item] = minimo
+        heapq.heapreplace(heap, (minimo + n, item))
+
+    def update(self, items: Iterable[Hashable], bloque: int | None = None) -> None:
+        """
+        Añade todos los elementos del iterable (sin materializarlo), agregando
+        antes cada bloque con Counter para reducir las operaciones sobre el heap.
+        El bloque (por defecto, y como máximo, `capacidad` tokens) acota el
+        Counter intermedio, así que la memoria no pasa de 2 * capacidad palabras.
+        """
+        bloque = self.capacidad if bloque is None else max(1, min(bloque, self.capacidad))
+        it = iter(items)
+        while True:
+            parcial = Counter(islice(it, bloque))
+            if not parcial:
+                return
+            for item, n in parcial.items():
+                self.add(item, n)
+
+    def error(self, item: Hashable) -> int:
+        """Sobreestimación máxima del conteo de item (0 si no está monitorizado)."""
+        return self._errores.get(item, 0)
+
+    def cota_error(self) -> float:
+        """Cota global del error de cualquier conteo: N / capacidad."""
+        return self.total / self.capacidad
+
+    def most_common(self, n: int | None = None) -> List[Tuple[Hashable, int]]:
+        """Las n palabras con mayor conteo estimado, como Counter.most_common."""
+        if n is None:
+            return sorted(self._conteos.items(), key=lambda kv: kv[1], reverse=True)
+        return heapq.nlargest(n, self._conteos.items(), key=lambda kv: kv[1])
+
+    def top_garantizado(self, n: int) -> bool:
+        """
+        True si el top-n devuelto por most_common es exactamente el real:
+        el conteo mínimo garantizado (conteo - error) de cada una de las n
+        primeras supera el conteo estimado de la n+1.
+        """
+        top = self.most_common(n + 1)
+        if len(top) <= n:
+            return True
+        siguiente = top[n][1]
+        return all(c - self._errores[w] >= siguiente for w, c in top[:n])
+
+    def values(self):
+        return self._conteos.values()
+
+    def items(self):
+        return self._conteos.items()
+
+    def keys(self):
+        return self._conteos.keys()
+
+    def __getitem__(self, item: Hashable) -> int:
+        return self._conteos.get(item, 0)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._conteos
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._conteos)
+
+    def __len__(self) -> int:
+        return len(self._conteos)
+
+    def __repr__(self) -> str:
+        return f"SpaceSaving(capacidad={self.capacidad}, total={self.total}, monitorizadas={len(self)})"
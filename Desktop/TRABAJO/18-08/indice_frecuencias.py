@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Índice persistente (SQLite) de frecuencias de términos por documento.
+
+Cada archivo se tokeniza una sola vez (con count_file de ejercicio2.py, sin
+quitar stopwords) y se guardan sus conteos crudos junto con un indicador de
+stopword por término. Después, top_n_words y compute_stats sobre cualquier
+subconjunto de documentos, con o sin stopwords, se responden con una
+consulta SQL sin volver a leer el texto. Al reindexar solo se procesan los
+archivos cuyo mtime o tamaño cambió.
+
+Uso:
+    with IndiceFrecuencias("indice.sqlite") as indice:
+        indice.indexar("articulos/**/*.txt")
+        resultado = indice.analizar(remove_stopwords=True, top_n=10)
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, Tuple
+
+from ejercicio2 import compute_stats, count_file, ensure_nltk_data, iter_corpus_files, top_n_words
+from paralelo import map_acotado
+from recursos_nltk import stopwords_idioma
+from tokenizacion import validar_backend
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documentos (
+    id INTEGER PRIMARY KEY,
+    ruta TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tamano INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terminos (
+    id INTEGER PRIMARY KEY,
+    palabra TEXT UNIQUE NOT NULL,
+    es_stopword INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conteos (
+    documento_id INTEGER NOT NULL REFERENCES documentos(id) ON DELETE CASCADE,
+    termino_id INTEGER NOT NULL REFERENCES terminos(id),
+    conteo INTEGER NOT NULL,
+    PRIMARY KEY (documento_id, termino_id)
+) WITHOUT ROWID;
+"""
+
+
+class IndiceFrecuencias:
+    """Índice de frecuencias por documento guardado en un archivo SQLite."""
+
+    def __init__(self, ruta_db: str, idioma: str = 'spanish', backend: str = 'punkt'):
+        self.idioma = idioma
+        self.backend = validar_backend(backend)
+        self._con = sqlite3.connect(ruta_db)
+        self._con.execute("PRAGMA foreign_keys = ON")
+        self._con.execute("PRAGMA journal_mode = WAL")
+        self._con.executescript(_ESQUEMA)
+        self._ids_terminos: Dict[str, int] | None = None
+        self._comprobar_configuracion()
+
+    def _comprobar_configuracion(self) -> None:
+        """Si el índice se creó con otro idioma o backend, se vacía para reindexar todo."""
+        actual = {"idioma": self.idioma, "backend": self.backend}
+        guardada = dict(self._con.execute("SELECT clave, valor FROM meta"))
+        if guardada == actual:
+            return
+        with self._con:
+            self._con.execute("DELETE FROM conteos")
+            self._con.execute("DELETE FROM documentos")
+            self._con.execute("DELETE FROM terminos")
+            self._con.execute("DELETE FROM meta")
+            self._con.executemany("INSERT INTO meta (clave, valor) VALUES (?, ?)", actual.items())
+
+    def _id_termino(self, palabra: str, stops: frozenset) -> int:
+        ids = self._ids_terminos
+        i = ids.get(palabra)
+        if i is None:
+            cur = self._con.execute(
+                "INSERT INTO terminos (palabra, es_stopword) VALUES (?, ?)",
+                (palabra, int(palabra in stops)),
+            )
+            i = ids[palabra] = cur.lastrowid
+        return i
+
+    def _guardar(self, ruta: str, mtime_ns: int, tamano: int, freqs: Counter) -> None:
+        """Reemplaza, en una transacción, los conteos de un documento."""
+        if self._ids_terminos is None:
+            self._ids_terminos = dict(self._con.execute("SELECT palabra, id FROM terminos"))
+        stops = stopwords_idioma(self.idioma)
+        try:
+            with self._con:
+                self._con.execute("DELETE FROM documentos WHERE ruta = ?", (ruta,))
+                doc_id = self._con.execute(
+                    "INSERT INTO documentos (ruta, mtime_ns, tamano) VALUES (?, ?, ?)",
+                    (ruta, mtime_ns, tamano),
+                ).lastrowid
+                filas = [(doc_id, self._id_termino(w, stops), c) for w, c in freqs.items()]
+                self._con.executemany(
+                    "INSERT INTO conteos (documento_id, termino_id, conteo) VALUES (?, ?, ?)", filas
+                )
+        except Exception:
+            # La transacción se deshizo: los ids de términos nuevos ya no valen
+            self._ids_terminos = None
+            raise
+
+    def pendientes(self, rutas: Iterable[str]) -> List[Tuple[str, int, int]]:
+        """(ruta, mtime_ns, tamaño) de los archivos nuevos o modificados."""
+        conocidos = {r: (m, t) for r, m, t in self._con.execute("SELECT ruta, mtime_ns, tamano FROM documentos")}
+        cambios = []
+        for ruta in rutas:
+            ruta = os.path.abspath(ruta)
+            st = os.stat(ruta)
+            if conocidos.get(ruta) != (st.st_mtime_ns, st.st_size):
+                cambios.append((ruta, st.st_mtime_ns, st.st_size))
+        return cambios
+
+    def indexar(self, source: str, max_workers: int = 4, podar: bool = True) -> int:
+        """
+        Indexa los archivos de `source` (directorio o patrón glob) que sean
+        nuevos o hayan cambiado. Con podar=True elimina del índice los
+        documentos de `source` que ya no existen. Devuelve cuántos se indexaron.
+        """
+        rutas = [os.path.abspath(r) for r in iter_corpus_files(source)]
+        if podar:
+            self._podar(source, set(rutas))
+        cambios = self.pendientes(rutas)
+        if not cambios:
+            return 0
+        ensure_nltk_data()
+        contar = partial(count_file, remove_stopwords=False, backend=self.backend)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            resultados = map_acotado(executor, contar, (r for r, _, _ in cambios), 2 * max_workers)
+            for (ruta, mtime_ns, tamano), freqs in zip(cambios, resultados):
+                self._guardar(ruta, mtime_ns, tamano, freqs)
+        return len(cambios)
+
+    def _podar(self, source: str, existentes: set) -> None:
+        if os.path.isdir(source):
+            prefijo = os.path.join(os.path.abspath(source), "")
+            indexadas = [r for (r,) in self._con.execute("SELECT ruta FROM documentos") if r.startswith(prefijo)]
+        else:
+            indexadas = [r for (r,) in self._con.execute("SELECT ruta FROM documentos") if not os.path.exists(r)]
+        with self._con:
+            self._con.executemany(
+                "DELETE FROM documentos WHERE ruta = ?",
+                ((r,) for r in indexadas if r not in existentes),
+            )
+
+    def documentos(self) -> List[str]:
+        """Rutas de los documentos indexados."""
+        return [r for (r,) in self._con.execute("SELECT ruta FROM documentos ORDER BY ruta")]
+
+    def frecuencias(self, rutas: Iterable[str] | None = None, remove_stopwords: bool = False) -> Counter:
+        """
+        Counter con la suma de conteos de los documentos indicados (todos si
+        rutas es None), sin releer ni retokenizar ningún archivo.
+        """
+        filtro = " AND t.es_stopword = 0" if remove_stopwords else ""
+        if rutas is None:
+            consulta = (
+                "SELECT t.palabra, SUM(c.conteo) FROM conteos c "
+                "JOIN terminos t ON t.id = c.termino_id WHERE 1" + filtro + " GROUP BY c.termino_id"
+            )
+            return Counter(dict(self._con.execute(consulta)))
+        # Subconjunto arbitrario (sin límite de parámetros): tabla temporal
+        self._con.execute("CREATE TEMP TABLE IF NOT EXISTS seleccion (ruta TEXT PRIMARY KEY)")
+        self._con.execute("DELETE FROM seleccion")
+        self._con.executemany("INSERT OR IGNORE INTO seleccion (ruta) VALUES (?)", ((os.path.abspath(r),) for r in rutas))
+        consulta = (
+            "SELECT t.palabra, SUM(c.conteo) FROM seleccion s "
+            "JOIN documentos d ON d.ruta = s.ruta "
+            "JOIN conteos c ON c.documento_id = d.id "
+            "JOIN terminos t ON t.id = c.termino_id WHERE 1" + filtro + " GROUP BY c.termino_id"
+        )
+        return Counter(dict(self._con.execute(consulta)))
+
+    def analizar(
+        self,
+        rutas: Iterable[str] | None = None,
+        remove_stopwords: bool = False,
+        top_n: int = 5,
+    ) -> Dict[str, object]:
+        """Top-N y estadísticas (mismo formato que analyze_corpus) a partir del índice."""
+        rutas = None if rutas is None else list(rutas)
+        freqs = self.frecuencias(rutas, remove_stopwords=remove_stopwords)
+        return {
+            "files": len(self.documentos()) if rutas is None else len(rutas),
+            "frequencies": freqs,
+            "top": top_n_words(freqs, n=top_n),
+            "stats": compute_stats(freqs),
+        }
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __enter__(self) -> "IndiceFrecuencias":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Medición opcional por etapas del pipeline (tokenización, minúsculas,
+isalpha, stopwords, conteo, estadísticas...).
+
+- Instrumentacion: configuración reutilizable con los sumideros (sinks) a
+  los que se publica cada perfil. Un sumidero es cualquier callable que
+  recibe un Perfil; aquí hay dos: SumideroLog (logging) y SumideroPrometheus
+  (archivo de texto para el textfile collector de node_exporter).
+- Perfil: mediciones de una llamada. Cada etapa acumula tiempo de reloj,
+  tiempo de CPU, elementos de entrada y de salida; si la misma etapa se
+  repite (p. ej. una vez por trozo de texto) se suman.
+
+Sin instrumentación, etapa(None, ...) devuelve siempre el mismo objeto nulo:
+no se lee ningún reloj ni se reserva memoria. Las entradas y salidas se
+pueden pasar como el objeto medido en lugar de su tamaño (etapa(p, "count",
+tokens), e.sumar_salidas(freqs)): len() solo se calcula si hay perfil, lo
+que importa cuando len no es O(1).
+
+Uso:
+    instr = Instrumentacion([SumideroLog(), SumideroPrometheus("/var/lib/node_exporter/texto.prom")])
+    result = analyze_text(texto, instrumentation=instr)
+    result["profile"].como_dict()
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sized, Tuple, Union
+
+# Número de elementos, o un objeto del que sacarlo con len()
+Tamano = Union[int, Sized]
+
+
+def _tamano(x: Tamano) -> int:
+    return x if isinstance(x, int) else len(x)
+
+
+class Etapa:
+    """Medición acumulada de una etapa; también hace de context manager."""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.segundos = 0.0
+        self.cpu_segundos = 0.0
+        self.entradas = 0
+        self.salidas = 0
+        self.llamadas = 0
+        self._t0 = 0.0
+        self._c0 = 0.0
+
+    def __enter__(self) -> "Etapa":
+        self._t0 = time.perf_counter()
+        self._c0 = time.thread_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.segundos += time.perf_counter() - self._t0
+        self.cpu_segundos += time.thread_time() - self._c0
+        self.llamadas += 1
+
+    def sumar_salidas(self, salidas: Tamano) -> None:
+        self.salidas += _tamano(salidas)
+
+    def como_dict(self) -> Dict[str, float]:
+        return {
+            "segundos": self.segundos,
+            "cpu_segundos": self.cpu_segundos,
+            "entradas": self.entradas,
+            "salidas": self.salidas,
+            "llamadas": self.llamadas,
+        }
+
+
+class _EtapaNula:
+    """Etapa que no mide nada (instrumentación desactivada)."""
+
+    entradas = salidas = 0
+
+    def __enter__(self) -> "_EtapaNula":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def sumar_salidas(self, salidas: Tamano) -> None:
+        pass
+
+    def __setattr__(self, nombre: str, valor) -> None:
+        pass
+
+
+_NULA = _EtapaNula()
+
+
+class Perfil:
+    """Mediciones por etapa de una llamada (p. ej. un analyze_text)."""
+
+    def __init__(self, operacion: str):
+        self.operacion = operacion
+        self.etapas: Dict[str, Etapa] = {}
+
+    def etapa(self, nombre: str, entradas: Tamano = 0) -> Etapa:
+        """Context manager que suma una ejecución de la etapa `nombre`."""
+        e = self.etapas.get(nombre)
+        if e is None:
+            e = self.etapas[nombre] = Etapa(nombre)
+        e.entradas += _tamano(entradas)
+        return e
+
+    @property
+    def segundos(self) -> float:
+        return sum(e.segundos for e in self.etapas.values())
+
+    def como_dict(self) -> Dict[str, object]:
+        return {"operacion": self.operacion, "etapas": {n: e.como_dict() for n, e in self.etapas.items()}}
+
+
+def etapa(perfil: Optional[Perfil], nombre: str, entradas: Tamano = 0):
+    """perfil.etapa(nombre, entradas), o la etapa nula si perfil es None."""
+    if perfil is None:
+        return _NULA
+    return perfil.etapa(nombre, entradas)
+
+
+class Instrumentacion:
+    """Crea perfiles y los publica en los sumideros configurados."""
+
+    def __init__(self, sumideros: Iterable[Callable[[Perfil], None]] = ()):
+        self.sumideros = list(sumideros)
+
+    def nuevo_perfil(self, operacion: str) -> Perfil:
+        return Perfil(operacion)
+
+    def publicar(self, perfil: Perfil) -> None:
+        for sumidero in self.sumideros:
+            sumidero(perfil)
+
+
+class SumideroLog:
+    """Escribe una línea de log por perfil con el tiempo y los elementos de cada etapa."""
+
+    def __init__(self, logger: logging.Logger | None = None, nivel: int = logging.INFO):
+        self.logger = logger or logging.getLogger("instrumentacion")
+        self.nivel = nivel
+
+    def __call__(self, perfil: Perfil) -> None:
+        if not self.logger.isEnabledFor(self.nivel):
+            return
+        partes = [
+            f"{e.nombre} {e.segundos * 1000:.1f}ms (cpu {e.cpu_segundos * 1000:.1f}ms) {e.entradas}->{e.salidas}"
+            for e in perfil.etapas.values()
+        ]
+        self.logger.log(self.nivel, "%s %.1fms: %s", perfil.operacion, perfil.segundos * 1000, "; ".join(partes))
+
+
+class SumideroPrometheus:
+    """
+    Acumula contadores por (operación, etapa) y reescribe `ruta` en el
+    formato de texto de Prometheus tras cada perfil. La escritura es atómica
+    (archivo temporal + os.replace), como pide el textfile collector.
+    """
+
+    _METRICAS = (
+        ("segundos_total", "segundos", "Tiempo de reloj por etapa"),
+        ("cpu_segundos_total", "cpu_segundos", "Tiempo de CPU por etapa"),
+        ("entradas_total", "entradas", "Elementos de entrada por etapa"),
+        ("salidas_total", "salidas", "Elementos de salida por etapa"),
+        ("llamadas_total", "llamadas", "Ejecuciones de cada etapa"),
+    )
+
+    def __init__(self, ruta: str, prefijo: str = "texto18"):
+        self.ruta = ruta
+        self.prefijo = prefijo
+        self._totales: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, perfil: Perfil) -> None:
+        with self._lock:
+            for e in perfil.etapas.values():
+                total = self._totales.setdefault((perfil.operacion, e.nombre), dict.fromkeys(
+                    [campo for _, campo, _ in self._METRICAS], 0))
+                for _, campo, _ in self._METRICAS:
+                    total[campo] += getattr(e, campo)
+            self._escribir()
+
+    def _escribir(self) -> None:
+        lineas = []
+        for sufijo, campo, ayuda in self._METRICAS:
+            nombre = f"{self.prefijo}_etapa_{sufijo}"
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} counter")
+            for (operacion, etapa_), total in sorted(self._totales.items()):
+                lineas.append(f'{nombre}{{operacion="{operacion}",etapa="{etapa_}"}} {total[campo]}')
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write("\n".join(lineas) + "\n")
+        os.replace(temporal, self.ruta)
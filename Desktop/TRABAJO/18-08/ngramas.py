@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Conteo de n-gramas (bigramas, trigramas...) y colocaciones con memoria acotada.
+
+ContadorNGramas recorre el flujo de tokens con una ventana deslizante de
+n_max tokens, sin construir nunca la lista de n-gramas. Cuando las tablas
+(unigramas incluidos) superan max_entradas se podan los n-gramas raros
+(conteo <= umbral, con el umbral subiendo hasta bajar a la mitad del
+límite). Un n-grama podado puede volver a entrar más tarde, así que su
+conteo se subestima como mucho en `poda_max` por cada poda en la que cayó.
+Solo sobrevive a una poda lo que en ese momento supera su umbral: con
+flujos muy variados el umbral sube y también se pierden n-gramas de
+frecuencia moderada; los conteos del top son fiables cuando su frecuencia
+está muy por encima de poda_max.
+
+Las colocaciones se puntúan sobre la tabla de bigramas con PMI y con la
+razón de verosimilitud de Dunning (log-likelihood, G²), vectorizadas con
+NumPy.
+"""
+from __future__ import annotations
+
+from collections import Counter, deque
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class ContadorNGramas:
+    """Cuenta n-gramas de 2 a n_max tokens con un tamaño total acotado."""
+
+    def __init__(self, n_max: int = 3, max_entradas: int = 1_000_000):
+        if n_max < 2:
+            raise ValueError("n_max debe ser >= 2")
+        self.n_max = n_max
+        self.max_entradas = max_entradas
+        self.unigramas: Counter = Counter()
+        self.total_tokens = 0
+        self.tablas: Dict[int, Counter] = {n: Counter() for n in range(2, n_max + 1)}
+        self.podas = 0
+        self.poda_max = 0
+
+    def update(self, tokens: Iterable[str]) -> None:
+        """
+        Añade los n-gramas de un flujo de tokens. Cada llamada es un documento:
+        no se forman n-gramas entre el final de uno y el principio del siguiente.
+        """
+        ventana: deque = deque(maxlen=self.n_max)
+        unigramas = self.unigramas
+        tablas = [(n, self.tablas[n]) for n in range(2, self.n_max + 1)]
+        for t in tokens:
+            ventana.append(t)
+            unigramas[t] += 1
+            self.total_tokens += 1
+            largo = len(ventana)
+            for n, tabla in tablas:
+                if n > largo:
+                    break
+                tabla[tuple(islice(ventana, largo - n, None))] += 1
+            if len(unigramas) + sum(len(tabla) for _, tabla in tablas) > self.max_entradas:
+                self._podar()
+
+    def entradas(self) -> int:
+        """Entradas guardadas entre todas las tablas, unigramas incluidos."""
+        return len(self.unigramas) + sum(len(t) for t in self.tablas.values())
+
+    def __len__(self) -> int:
+        return self.entradas()
+
+    def _podar(self) -> None:
+        """Elimina n-gramas raros hasta quedar en la mitad de max_entradas."""
+        objetivo = self.max_entradas // 2
+        umbral = 1
+        while self.entradas() > objetivo:
+            for tabla in (self.unigramas, *self.tablas.values()):
+                for ngrama in [g for g, c in tabla.items() if c <= umbral]:
+                    del tabla[ngrama]
+            self.poda_max = max(self.poda_max, umbral)
+            umbral += 1
+        self.podas += 1
+
+    def top(self, n: int, k: int = 10) -> List[Tuple[Tuple[str, ...], int]]:
+        """Los k n-gramas de tamaño n más frecuentes."""
+        return self.tablas[n].most_common(k)
+
+    def colocaciones(self, k: int = 10, min_freq: int = 2) -> Dict[str, List[Tuple[Tuple[str, str], float]]]:
+        """
+        Las k mejores colocaciones (bigramas con frecuencia >= min_freq)
+        según PMI y según log-likelihood.
+        """
+        bigramas = [(g, c) for g, c in self.tablas[2].items() if c >= min_freq]
+        if not bigramas:
+            return {"pmi": [], "log_likelihood": []}
+        uni = self.unigramas
+        n_ii = np.array([c for _, c in bigramas], dtype=float)
+        n_ix = np.array([uni[a] for (a, _), _ in bigramas], dtype=float)
+        n_xi = np.array([uni[b] for (_, b), _ in bigramas], dtype=float)
+        n_xx = float(self.total_tokens)
+        pmi = np.log2(n_ii * n_xx / (n_ix * n_xi))
+        # Tabla de contingencia 2x2 de cada bigrama (observados y esperados)
+        obs = np.stack([
+            n_ii,
+            np.maximum(n_ix - n_ii, 0),
+            np.maximum(n_xi - n_ii, 0),
+            np.maximum(n_xx - n_ix - n_xi + n_ii, 0),
+        ])
+        filas = np.stack([n_ix, n_ix, n_xx - n_ix, n_xx - n_ix])
+        columnas = np.stack([n_xi, n_xx - n_xi, n_xi, n_xx - n_xi])
+        esperados = filas * columnas / n_xx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terminos = np.where(obs > 0, obs * np.log(obs / esperados), 0.0)
+        ll = 2.0 * terminos.sum(axis=0)
+
+        def mejores(puntos: np.ndarray) -> List[Tuple[Tuple[str, str], float]]:
+            orden = np.argsort(-puntos, kind="stable")[:k]
+            return [(bigramas[i][0], float(puntos[i])) for i in orden]
+
+        return {"pmi": mejores(pmi), "log_likelihood": mejores(ll)}
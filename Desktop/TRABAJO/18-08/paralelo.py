@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Utilidades de concurrencia compartidas por los scripts de 18-08.
+
+map_acotado se comporta como Executor.map, pero sin consumir el iterable
+completo de antemano: solo mantiene `max_pendientes` tareas en vuelo, de modo
+que la memoria depende del número de workers y no del tamaño de la entrada.
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import Callable, Deque, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def en_lotes(iterable: Iterable[T], tamano: int) -> Iterator[List[T]]:
+    """Agrupa el iterable en listas de `tamano` elementos (la última puede ser menor)."""
+    it = iter(iterable)
+    while True:
+        lote = list(islice(it, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def map_acotado(
+    executor: Executor,
+    fn: Callable[[T], R],
+    iterable: Iterable[T],
+    max_pendientes: int,
+) -> Iterator[R]:
+    """
+    Aplica fn a cada elemento usando el executor y devuelve los resultados
+    en el mismo orden de la entrada, con a lo sumo `max_pendientes` tareas
+    enviadas y sin recoger a la vez.
+    """
+    if max_pendientes < 1:
+        raise ValueError("max_pendientes debe ser >= 1")
+    pendientes: Deque[Future] = deque()
+    for item in iterable:
+        if len(pendientes) >= max_pendientes:
+            yield pendientes.popleft().result()
+        pendientes.append(executor.submit(fn, item))
+    while pendientes:
+        yield pendientes.popleft().result()
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de recursos de NLTK compartido por los scripts de 18-08.
+
+- Cada recurso (punkt/punkt_tab, stopwords) se busca con nltk.data.find una
+  sola vez por proceso; si falta, se descarga en silencio.
+- Las stopwords se leen de disco una vez por idioma y se guardan como
+  frozenset, así que las llamadas por documento no pagan ningún coste de
+  preparación.
+
+Paquete local (sin red): `python recursos_nltk.py` vuelca los parámetros de
+Punkt y las stopwords de cada idioma a un directorio (por defecto
+paquete_nltk/ junto a este archivo, o el de la variable PAQUETE_NLTK) en
+JSON, con un manifiesto de sumas SHA-256 que se comprueban al cargar. Si el
+paquete existe, tokenizador_frases y stopwords_idioma lo usan directamente y
+no se consulta nltk_data ni se descarga nada; los idiomas que no estén en el
+paquete siguen el camino normal de NLTK.
+
+Requisitos: nltk
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Sequence
+
+import nltk
+from nltk.corpus import stopwords
+from nltk.tokenize.punkt import PunktParameters, PunktSentenceTokenizer
+
+# Nombre de descarga -> ruta para nltk.data.find
+RUTAS_RECURSOS = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+}
+
+# Palabras comunes en redes sociales que no aportan al análisis de comentarios
+STOPWORDS_REDES: FrozenSet[str] = frozenset(
+    {'jaja', 'jeje', 'jiji', 'wow', 'omg', 'xd', 'lol', 'rt', 'dm', 'like', 'follow'}
+)
+
+_RUTA_PAQUETE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paquete_nltk")
+_MANIFIESTO = "manifiesto.json"
+
+_resueltos: set = set()
+_lock = threading.Lock()
+
+
+def ruta_paquete() -> str:
+    """Directorio del paquete local de recursos (variable PAQUETE_NLTK o paquete_nltk/)."""
+    return os.environ.get("PAQUETE_NLTK", _RUTA_PAQUETE)
+
+
+@lru_cache(maxsize=None)
+def _manifiesto(ruta: str) -> Dict[str, str]:
+    """Archivo -> SHA-256 del paquete en `ruta`; vacío si no hay paquete."""
+    try:
+        with open(os.path.join(ruta, _MANIFIESTO), encoding="utf-8") as f:
+            return json.load(f)["archivos"]
+    except FileNotFoundError:
+        return {}
+
+
+def _leer_del_paquete(nombre: str) -> bytes | None:
+    """Contenido verificado de un archivo del paquete, o None si no está."""
+    ruta = ruta_paquete()
+    suma = _manifiesto(ruta).get(nombre)
+    if suma is None:
+        return None
+    with open(os.path.join(ruta, nombre), "rb") as f:
+        datos = f.read()
+    if hashlib.sha256(datos).hexdigest() != suma:
+        raise ValueError(f"suma SHA-256 incorrecta en {os.path.join(ruta, nombre)}; vuelve a generar el paquete")
+    return datos
+
+
+def _en_paquete(nombre: str) -> bool:
+    """True si el paquete local incluye algún idioma del recurso indicado."""
+    prefijo = "punkt_" if nombre in ("punkt", "punkt_tab") else f"{nombre}_"
+    return any(archivo.startswith(prefijo) for archivo in _manifiesto(ruta_paquete()))
+
+
+def asegurar_recursos(*nombres: str) -> None:
+    """
+    Garantiza que los recursos de NLTK indicados estén disponibles.
+
+    Tras la primera llamada con un recurso, las siguientes solo consultan un
+    set. Los recursos que trae el paquete local no se buscan en nltk_data.
+    """
+    if _resueltos.issuperset(nombres):
+        return
+    with _lock:
+        for nombre in nombres:
+            if nombre in _resueltos:
+                continue
+            if not _en_paquete(nombre):
+                _buscar_o_descargar(nombre)
+            _resueltos.add(nombre)
+
+
+def _buscar_o_descargar(nombre: str) -> None:
+    try:
+        nltk.data.find(RUTAS_RECURSOS[nombre])
+    except LookupError:
+        nltk.download(nombre, quiet=True)
+
+
+def recurso_punkt() -> str:
+    """
+    Nombre del modelo Punkt que usa la versión instalada de NLTK:
+    'punkt_tab' desde NLTK 3.8.2, 'punkt' (pickle) en versiones anteriores.
+    """
+    return "punkt_tab" if hasattr(nltk.tokenize.punkt, "PunktTokenizer") else "punkt"
+
+
+def asegurar_tokenizador() -> None:
+    """Garantiza el modelo Punkt que necesitan word_tokenize/sent_tokenize."""
+    asegurar_recursos(recurso_punkt())
+
+
+@lru_cache(maxsize=None)
+def tokenizador_frases(idioma: str = 'spanish'):
+    """
+    Tokenizador Punkt de frases del idioma, cargado una vez por proceso
+    (del paquete local si lo incluye). A diferencia de sent_tokenize expone
+    span_tokenize (offsets de cada frase).
+    """
+    datos = _leer_del_paquete(f"punkt_{idioma}.json")
+    if datos is not None:
+        tokenizador = PunktSentenceTokenizer()
+        tokenizador._params = _parametros_punkt(json.loads(datos))
+        return tokenizador
+    _buscar_o_descargar(recurso_punkt())
+    if recurso_punkt() == "punkt_tab":
+        return nltk.tokenize.punkt.PunktTokenizer(idioma)
+    return nltk.data.load(f"tokenizers/punkt/{idioma}.pickle")
+
+
+@lru_cache(maxsize=128)
+def stopwords_idioma(idioma: str = 'spanish', extra: FrozenSet[str] = frozenset()) -> FrozenSet[str]:
+    """
+    Devuelve las stopwords de NLTK del idioma (más `extra`) como frozenset.
+
+    El resultado se cachea por (idioma, extra): pasar siempre el mismo
+    frozenset de extras (p. ej. STOPWORDS_REDES) no vuelve a leer el disco.
+    """
+    if extra:
+        return stopwords_idioma(idioma) | extra
+    datos = _leer_del_paquete(f"stopwords_{idioma}.txt")
+    if datos is not None:
+        return frozenset(datos.decode("utf-8").split("\n"))
+    _buscar_o_descargar("stopwords")
+    return frozenset(stopwords.words(idioma))
+
+
+def stopwords_con_extra(idioma: str = 'spanish', extra: Iterable[str] | None = None) -> FrozenSet[str]:
+    """
+    Como stopwords_idioma, pero acepta cualquier iterable de extras (se pasan
+    siempre a minúsculas, también si llegan como frozenset).
+    """
+    if not extra:
+        return stopwords_idioma(idioma)
+    return stopwords_idioma(idioma, frozenset(map(str.lower, extra)))
+
+
+def _parametros_punkt(datos: dict) -> PunktParameters:
+    params = PunktParameters()
+    params.abbrev_types = set(datos["abbrev_types"])
+    params.collocations = {tuple(par) for par in datos["collocations"]}
+    params.sent_starters = set(datos["sent_starters"])
+    params.ortho_context = defaultdict(int, datos["ortho_context"])
+    return params
+
+
+def empaquetar(destino: str | None = None, idiomas: Sequence[str] = ("spanish", "english")) -> str:
+    """
+    Genera el paquete local a partir de los datos de NLTK instalados (se
+    descargan si faltan; es el único paso que puede usar la red).
+    Devuelve el directorio del paquete.
+    """
+    destino = ruta_paquete() if destino is None else destino
+    os.makedirs(destino, exist_ok=True)
+    _buscar_o_descargar(recurso_punkt())
+    _buscar_o_descargar("stopwords")
+    archivos: Dict[str, bytes] = {}
+    for idioma in idiomas:
+        if recurso_punkt() == "punkt_tab":
+            params = nltk.tokenize.punkt.PunktTokenizer(idioma)._params
+        else:
+            params = nltk.data.load(f"tokenizers/punkt/{idioma}.pickle")._params
+        archivos[f"punkt_{idioma}.json"] = json.dumps({
+            "abbrev_types": sorted(params.abbrev_types),
+            "collocations": sorted(params.collocations),
+            "sent_starters": sorted(params.sent_starters),
+            "ortho_context": dict(sorted(params.ortho_context.items())),
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        archivos[f"stopwords_{idioma}.txt"] = "\n".join(stopwords.words(idioma)).encode("utf-8")
+    for nombre, datos in archivos.items():
+        with open(os.path.join(destino, nombre), "wb") as f:
+            f.write(datos)
+    manifiesto = {
+        "nltk": nltk.__version__,
+        "archivos": {nombre: hashlib.sha256(datos).hexdigest() for nombre, datos in archivos.items()},
+    }
+    with open(os.path.join(destino, _MANIFIESTO), "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2, sort_keys=True)
+    _manifiesto.cache_clear()
+    return destino
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el paquete local de recursos de NLTK.")
+    parser.add_argument("--destino", help="directorio del paquete (por defecto PAQUETE_NLTK o paquete_nltk/)")
+    parser.add_argument("--idiomas", nargs="+", default=["spanish", "english"])
+    args = parser.parse_args()
+    print(f"Paquete generado en {empaquetar(args.destino, args.idiomas)}")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servicio local (asyncio) de tendencias de palabras en comentarios.
+
+Recibe flujos de comentarios por HTTP (TCP local o socket Unix), los limpia
+con las mismas reglas que limpiar_y_analizar_comentarios
+(ejercicio_propuesto5.py) y mantiene FreqDists por intervalos de tiempo
+para dar el top-N de las ventanas móviles de 5 minutos, 1 hora y 24 horas.
+
+Endpoints:
+  POST /comentarios        cuerpo: lista JSON de cadenas o un comentario por línea
+  GET  /top?ventana=1h&n=10
+  GET  /salud
+
+Uso:
+  python servicio_comentarios.py --port 8765
+  python servicio_comentarios.py --unix /tmp/comentarios.sock
+
+  curl -X POST --data-binary @comentarios.txt http://127.0.0.1:8765/comentarios
+  curl "http://127.0.0.1:8765/top?ventana=5m&n=10"
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import heapq
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from nltk.probability import FreqDist
+
+from ejercicio_propuesto5 import limpiar_comentario
+
+# nombre -> (duración de la ventana, ancho de cada intervalo), en segundos
+VENTANAS: Dict[str, Tuple[int, int]] = {
+    "5m": (5 * 60, 10),
+    "1h": (60 * 60, 60),
+    "24h": (24 * 60 * 60, 15 * 60),
+}
+
+
+class VentanaDeslizante:
+    """
+    Frecuencias de las últimas `duracion` segundos, en intervalos de `ancho`.
+
+    Cada intervalo es un FreqDist en una deque; además se mantiene el total
+    de la ventana. Expulsar un intervalo caducado es un popleft de la deque
+    más restar sus conteos al total: cada token se suma y se resta una sola
+    vez, así que el coste es O(1) amortizado por token ingerido.
+    """
+
+    def __init__(self, duracion: int, ancho: int):
+        self.duracion = duracion
+        self.ancho = ancho
+        self.intervalos: Deque[Tuple[int, FreqDist]] = deque()
+        self.total = FreqDist()
+
+    def agregar(self, tokens: Iterable[str], ahora: float) -> None:
+        inicio = int(ahora // self.ancho) * self.ancho
+        if not self.intervalos or self.intervalos[-1][0] != inicio:
+            self.intervalos.append((inicio, FreqDist()))
+        intervalo = self.intervalos[-1][1]
+        for t in tokens:
+            intervalo[t] += 1
+            self.total[t] += 1
+
+    def expulsar(self, ahora: float) -> None:
+        """Quita los intervalos que ya quedaron fuera de la ventana."""
+        limite = ahora - self.duracion
+        total = self.total
+        while self.intervalos and self.intervalos[0][0] + self.ancho <= limite:
+            _, viejo = self.intervalos.popleft()
+            for palabra, c in viejo.items():
+                restante = total[palabra] - c
+                if restante > 0:
+                    total[palabra] = restante
+                else:
+                    del total[palabra]
+
+
+class ServicioTendencias:
+    """
+    Estado del servicio: ventanas móviles y top-N precalculado de cada una.
+
+    Las ventanas solo se modifican bajo un lock y fuera del bucle de eventos
+    (ingerir y refrescar se llaman con asyncio.to_thread); las consultas leen
+    instantáneas inmutables sustituidas de una sola vez. Mientras solo
+    llegan datos, el top nuevo sale del anterior más las palabras que
+    subieron desde el último refresco; el top se recalcula sobre todo el
+    vocabulario de la ventana solo cuando caduca un intervalo.
+    """
+
+    def __init__(self, ventanas: Dict[str, Tuple[int, int]] = VENTANAS, top_max: int = 100):
+        self.ventanas = {nombre: VentanaDeslizante(d, a) for nombre, (d, a) in ventanas.items()}
+        self.top_max = top_max
+        self.comentarios = 0
+        # Instantáneas inmutables que leen las consultas
+        self._top: Dict[str, List[Tuple[str, int]]] = {nombre: [] for nombre in self.ventanas}
+        # Palabras que subieron desde el último refresco
+        self._tocadas: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def ingerir(self, limpios: Iterable[List[str]], ahora: float | None = None) -> int:
+        """Suma comentarios ya limpios a todas las ventanas. Devuelve cuántos."""
+        ahora = time.time() if ahora is None else ahora
+        n = 0
+        with self._lock:
+            for tokens in limpios:
+                for ventana in self.ventanas.values():
+                    ventana.agregar(tokens, ahora)
+                self._tocadas.update(tokens)
+                n += 1
+            self.comentarios += n
+        return n
+
+    def refrescar(self, ahora: float | None = None) -> None:
+        """
+        Expulsa intervalos caducados y recalcula las instantáneas de top-N
+        de las ventanas que recibieron datos o perdieron un intervalo.
+        """
+        ahora = time.time() if ahora is None else ahora
+        with self._lock:
+            tocadas, self._tocadas = self._tocadas, set()
+            nuevo = dict(self._top)
+            for nombre, ventana in self.ventanas.items():
+                antes = len(ventana.intervalos)
+                ventana.expulsar(ahora)
+                total = ventana.total
+                if len(ventana.intervalos) != antes:
+                    # Alguna palabra bajó: hay que mirar todo el vocabulario
+                    nuevo[nombre] = _top_n(total.items(), self.top_max)
+                elif tocadas:
+                    # Solo hubo sumas: quien no estaba en el top y no subió sigue fuera
+                    candidatas = tocadas.union(w for w, _ in self._top[nombre])
+                    nuevo[nombre] = _top_n(((w, total[w]) for w in candidatas), self.top_max)
+        self._top = nuevo
+
+    def top(self, ventana: str, n: int = 10) -> List[Tuple[str, int]]:
+        """Top-n de la ventana desde la última instantánea (n <= top_max)."""
+        return self._top[ventana][:n]
+
+
+def _top_n(pares: Iterable[Tuple[str, int]], n: int) -> List[Tuple[str, int]]:
+    """Los n pares de mayor conteo; los empates, en orden alfabético."""
+    return heapq.nsmallest(n, pares, key=lambda par: (-par[1], par[0]))
+
+
+def _limpiar_lote(comentarios: List[str]) -> List[List[str]]:
+    return [limpiar_comentario(c) for c in comentarios]
+
+
+def _respuesta(estado: int, cuerpo: object) -> bytes:
+    datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+    razon = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(estado, "Error")
+    cabecera = (
+        f"HTTP/1.1 {estado} {razon}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(datos)}\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    )
+    return cabecera.encode("ascii") + datos
+
+
+def _leer_comentarios(cuerpo: bytes) -> List[str]:
+    texto = cuerpo.decode("utf-8")
+    if texto.lstrip().startswith("["):
+        return [c for c in json.loads(texto) if isinstance(c, str)]
+    return [linea for linea in texto.splitlines() if linea.strip()]
+
+
+async def _atender(servicio: ServicioTendencias, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Bucle de una conexión HTTP/1.1 (admite keep-alive)."""
+    try:
+        while True:
+            linea = await reader.readline()
+            if not linea:
+                break
+            metodo, destino, _ = linea.decode("latin-1").split(" ", 2)
+            cabeceras = {}
+            while True:
+                h = await reader.readline()
+                if h in (b"\r\n", b"\n", b""):
+                    break
+                clave, _, valor = h.decode("latin-1").partition(":")
+                cabeceras[clave.strip().lower()] = valor.strip()
+            cuerpo = await reader.readexactly(int(cabeceras.get("content-length", 0)))
+            url = urlsplit(destino)
+            params = parse_qs(url.query)
+            try:
+                if metodo == "GET" and url.path == "/top":
+                    ventana = params.get("ventana", ["1h"])[0]
+                    n = int(params.get("n", ["10"])[0])
+                    if ventana not in servicio.ventanas:
+                        respuesta = _respuesta(400, {"error": f"ventana desconocida: {ventana}"})
+                    else:
+                        respuesta = _respuesta(200, {"ventana": ventana, "top": servicio.top(ventana, n)})
+                elif metodo == "POST" and url.path == "/comentarios":
+                    comentarios = _leer_comentarios(cuerpo)
+                    # Tokenización e ingesta van en hilos para no bloquear las consultas
+                    limpios = await asyncio.to_thread(_limpiar_lote, comentarios)
+                    aceptados = await asyncio.to_thread(servicio.ingerir, limpios)
+                    respuesta = _respuesta(200, {"aceptados": aceptados})
+                elif metodo == "GET" and url.path == "/salud":
+                    respuesta = _respuesta(200, {"estado": "ok", "comentarios": servicio.comentarios})
+                else:
+                    respuesta = _respuesta(404, {"error": "ruta no encontrada"})
+            except (ValueError, UnicodeDecodeError) as e:
+                respuesta = _respuesta(400, {"error": str(e)})
+            writer.write(respuesta)
+            await writer.drain()
+            if cabeceras.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _refrescar_periodicamente(servicio: ServicioTendencias, intervalo: float) -> None:
+    while True:
+        await asyncio.to_thread(servicio.refrescar)
+        await asyncio.sleep(intervalo)
+
+
+async def servir(host: str = "127.0.0.1", port: int = 8765, unix: str | None = None, intervalo: float = 0.5) -> None:
+    """Arranca el servidor y el refresco periódico de las instantáneas."""
+    servicio = ServicioTendencias()
+
+    async def atender(reader, writer):
+        await _atender(servicio, reader, writer)
+
+    if unix:
+        servidor = await asyncio.start_unix_server(atender, path=unix)
+        print(f"Escuchando en unix:{unix}")
+    else:
+        servidor = await asyncio.start_server(atender, host, port)
+        print(f"Escuchando en http://{host}:{port}")
+    refresco = asyncio.create_task(_refrescar_periodicamente(servicio, intervalo))
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        refresco.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="ruta de un socket Unix (en lugar de TCP)")
+    parser.add_argument("--refresco", type=float, default=0.5, help="segundos entre recálculos del top-N")
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.port, args.unix, args.refresco))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Stemming en español (Snowball de NLTK) memoizado.
+
+SnowballStemmer('spanish').stem cuesta varios microsegundos por palabra,
+pero en un texto la misma palabra se repite muchísimo: StemmerCacheado
+guarda las raíces en un LRU acotado (functools.lru_cache, implementado en C)
+y cada palabra repetida cuesta una consulta al diccionario. estadisticas()
+cuenta por token: un acierto es un token cuya raíz se obtuvo sin llamar a
+Snowball (por el LRU o porque la palabra ya salió antes en el mismo lote) y
+un fallo, una llamada a Snowball; aparte se dan los aciertos del propio LRU.
+
+Para frecuencias ya contadas (Counter, TablaFrecuencias...) stem_conteo
+aplica el stemming una sola vez por palabra distinta y suma los conteos de
+las palabras que comparten raíz.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping
+
+import numpy as np
+from nltk.stem.snowball import SnowballStemmer
+
+
+class StemmerCacheado:
+    """SnowballStemmer con un LRU de como mucho max_entradas raíces."""
+
+    def __init__(self, idioma: str = "spanish", max_entradas: int = 200_000):
+        self.idioma = idioma
+        self.max_entradas = max_entradas
+        self._stemmer = SnowballStemmer(idioma)
+        self._stem = lru_cache(maxsize=max_entradas)(self._stemmer.stem)
+        self._tokens = 0
+
+    def stem(self, palabra: str) -> str:
+        self._tokens += 1
+        return self._stem(palabra)
+
+    def stem_tokens(self, tokens: Iterable[str]) -> List[str]:
+        """
+        Raíz de cada token. El LRU se consulta una vez por palabra distinta
+        del lote y los tokens se traducen con un dict local, más barato que
+        una llamada por token.
+        """
+        tokens = tokens if isinstance(tokens, list) else list(tokens)
+        self._tokens += len(tokens)
+        stem = self._stem
+        raices = {w: stem(w) for w in set(tokens)}
+        return list(map(raices.__getitem__, tokens))
+
+    def stem_conteo(self, freqs: Mapping[str, int]) -> Counter:
+        """Agrupa las frecuencias por raíz (una llamada al stemmer por palabra distinta)."""
+        stem = self._stem
+        raices: Counter = Counter()
+        for palabra, c in freqs.items():
+            raices[stem(palabra)] += int(c)
+            self._tokens += int(c)
+        return raices
+
+    def stem_ids(self, ids: np.ndarray, vocabulario) -> np.ndarray:
+        """
+        Raíces de un array de ids sobre un Vocabulario (las raíces se añaden
+        al mismo vocabulario). Solo se hace stemming de los ids distintos.
+        """
+        if not len(ids):
+            return ids
+        presentes = np.unique(ids)
+        stem = self._stem
+        raices = vocabulario.codificar([stem(w) for w in vocabulario.decodificar(presentes)])
+        self._tokens += len(ids)
+        mapa = np.zeros(int(presentes[-1]) + 1, dtype=np.uint32)
+        mapa[presentes] = raices
+        return mapa[ids]
+
+    def estadisticas(self) -> Dict[str, float]:
+        info = self._stem.cache_info()
+        consultas = info.hits + info.misses
+        aciertos = self._tokens - info.misses
+        return {
+            "tokens": self._tokens,
+            "aciertos": aciertos,
+            "fallos": info.misses,
+            "tasa_aciertos": aciertos / self._tokens if self._tokens else 0.0,
+            "aciertos_lru": info.hits,
+            "tasa_aciertos_lru": info.hits / consultas if consultas else 0.0,
+            "entradas": info.currsize,
+            "max_entradas": self.max_entradas,
+        }
+
+    def limpiar(self) -> None:
+        self._stem.cache_clear()
+        self._tokens = 0
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Tabla de frecuencias compacta, fusionable y serializable.
+
+TablaFrecuencias guarda las palabras ordenadas (por sus bytes UTF-8, que es
+el mismo orden que el de los puntos de código) en arrays paralelos:
+- un único bloque de bytes UTF-8 con todas las palabras, más sus offsets
+- los conteos como uint32 (uint64 si alguno no cabe)
+
+Frente a un Counter no hay un objeto str ni un int por palabra: un
+vocabulario de millones de palabras ocupa unos pocos bytes por entrada.
+Buscar una palabra es una búsqueda binaria; el top-k usa argpartition;
+fusionar tablas (p. ej. las de varios documentos o procesos) se hace con
+NumPy sin pasar por diccionarios. guardar/cargar usan .npz sin pickle.
+
+Imita la API de lectura de Counter (most_common, values, items, keys, [])
+como ConteoIds, así que top_n_words, compute_stats y los gráficos la aceptan.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from vocabulario import bloque_utf8, guardar_arrays
+
+# Palabras más largas que esto (en bytes) fusionan con heapq en lugar de
+# arrays de ancho fijo, para no reservar ancho_max bytes por entrada
+_ANCHO_MAX_VECTORIZADO = 64
+
+
+def _conteos_compactos(conteos: np.ndarray) -> np.ndarray:
+    """uint32 si todos los conteos caben; si no, uint64."""
+    if conteos.size and int(conteos.max()) > np.iinfo(np.uint32).max:
+        return conteos.astype(np.uint64, copy=False)
+    return conteos.astype(np.uint32, copy=False)
+
+
+class TablaFrecuencias:
+    """Palabras ordenadas y sus conteos en arrays paralelos."""
+
+    def __init__(self, bloque: bytes, offsets: np.ndarray, conteos: np.ndarray):
+        self.bloque = bloque
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.conteos = _conteos_compactos(np.asarray(conteos))
+
+    # -- construcción ---------------------------------------------------
+
+    @classmethod
+    def _desde_ordenados(cls, pares: Iterable[Tuple[bytes, int]]) -> "TablaFrecuencias":
+        palabras: List[bytes] = []
+        conteos: List[int] = []
+        for w, c in pares:
+            palabras.append(w)
+            conteos.append(c)
+        bloque, offsets = bloque_utf8(palabras)
+        return cls(bloque, offsets, np.array(conteos, dtype=np.uint64))
+
+    @classmethod
+    def desde_conteo(cls, freqs: Mapping[str, int]) -> "TablaFrecuencias":
+        """Desde Counter, FreqDist, SpaceSaving, ConteoIds o cualquier dict palabra -> conteo."""
+        return cls._desde_ordenados(sorted((w.encode("utf-8"), int(c)) for w, c in freqs.items() if c > 0))
+
+    @classmethod
+    def desde_tokens(cls, tokens: Iterable[str]) -> "TablaFrecuencias":
+        return cls.desde_conteo(Counter(tokens))
+
+    # -- lectura ----------------------------------------------------------
+
+    def palabra(self, i: int) -> str:
+        return self.bloque[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def indice(self, palabra: str) -> int:
+        """Posición de la palabra (búsqueda binaria), o -1 si no está."""
+        clave = palabra.encode("utf-8")
+        bloque, offsets = self.bloque, self.offsets
+        lo, hi = 0, len(self.conteos)
+        while lo < hi:
+            mitad = (lo + hi) // 2
+            if bloque[offsets[mitad]:offsets[mitad + 1]] < clave:
+                lo = mitad + 1
+            else:
+                hi = mitad
+        if lo < len(self.conteos) and bloque[offsets[lo]:offsets[lo + 1]] == clave:
+            return lo
+        return -1
+
+    def most_common(self, n: int | None = None) -> List[Tuple[str, int]]:
+        """Las n palabras más frecuentes (argpartition); los empates, en orden alfabético."""
+        conteos = self.conteos
+        if n is None or n >= len(conteos):
+            n = len(conteos)
+        if n <= 0:
+            return []
+        umbral = conteos[np.argpartition(conteos, -n)[-n]]
+        mayores = np.flatnonzero(conteos > umbral)
+        empatados = np.flatnonzero(conteos == umbral)[: n - len(mayores)]
+        idx = np.concatenate([mayores, empatados])
+        idx = idx[np.lexsort((idx, -conteos[idx].astype(np.int64)))]
+        return [(self.palabra(i), int(conteos[i])) for i in idx]
+
+    def values(self) -> np.ndarray:
+        return self.conteos
+
+    def keys(self) -> Iterator[str]:
+        bloque, offsets = self.bloque, self.offsets
+        return (bloque[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:]))
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        return zip(self.keys(), map(int, self.conteos))
+
+    def total(self) -> int:
+        return int(self.conteos.sum(dtype=np.uint64))
+
+    def como_counter(self) -> Counter:
+        return Counter(dict(self.items()))
+
+    def __getitem__(self, palabra: str) -> int:
+        i = self.indice(palabra)
+        return int(self.conteos[i]) if i >= 0 else 0
+
+    def __contains__(self, palabra: str) -> bool:
+        return self.indice(palabra) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def __len__(self) -> int:
+        return len(self.conteos)
+
+    def __add__(self, otra: "TablaFrecuencias") -> "TablaFrecuencias":
+        return fusionar_tablas([self, otra])
+
+    def __eq__(self, otra: object) -> bool:
+        if not isinstance(otra, TablaFrecuencias):
+            return NotImplemented
+        return (
+            self.bloque == otra.bloque
+            and np.array_equal(self.offsets, otra.offsets)
+            and np.array_equal(self.conteos, otra.conteos)
+        )
+
+    # -- serialización ----------------------------------------------------
+
+    def guardar(self, ruta: str, comprimido: bool = False) -> None:
+        """
+        Guarda la tabla en formato .npz (los tres arrays, sin pickle)
+        exactamente en `ruta`, sin añadirle la extensión .npz.
+        """
+        guardar_arrays(
+            ruta,
+            comprimido,
+            palabras_utf8=self.bloque,
+            palabras_offsets=self.offsets,
+            conteos=self.conteos,
+        )
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "TablaFrecuencias":
+        with np.load(ruta, allow_pickle=False) as f:
+            return cls(f["palabras_utf8"].tobytes(), f["palabras_offsets"], f["conteos"])
+
+    # -- fusión -------------------------------------------------------------
+
+    def _longitudes(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def _pares_bytes(self) -> Iterator[Tuple[bytes, int]]:
+        bloque = self.bloque
+        return zip((bloque[a:b] for a, b in zip(self.offsets[:-1], self.offsets[1:])), map(int, self.conteos))
+
+    def _ancho_fijo(self, ancho: int) -> np.ndarray:
+        """Las palabras como array 'S{ancho}' (rellenas con ceros), sin bucles de Python."""
+        n = len(self.conteos)
+        largos = self._longitudes()
+        matriz = np.zeros((n, ancho), dtype=np.uint8)
+        filas = np.repeat(np.arange(n), largos)
+        columnas = np.arange(int(self.offsets[-1])) - np.repeat(self.offsets[:-1], largos)
+        matriz[filas, columnas] = np.frombuffer(self.bloque, dtype=np.uint8)
+        return matriz.view(f"S{ancho}").ravel()
+
+
+def _desde_ancho_fijo(palabras: np.ndarray, conteos: np.ndarray) -> TablaFrecuencias:
+    ancho = palabras.dtype.itemsize
+    matriz = palabras.view(np.uint8).reshape(len(palabras), ancho)
+    largos = np.char.str_len(palabras)
+    bloque = matriz[np.arange(ancho) < largos[:, None]].tobytes()
+    offsets = np.zeros(len(palabras) + 1, dtype=np.int64)
+    np.cumsum(largos, out=offsets[1:])
+    return TablaFrecuencias(bloque, offsets, conteos)
+
+
+def fusionar_tablas(tablas: Iterable[TablaFrecuencias]) -> TablaFrecuencias:
+    """
+    Suma varias tablas. Con palabras de hasta 64 bytes todo es NumPy:
+    arrays de ancho fijo, argsort estable y np.add.reduceat sobre los
+    grupos de palabras iguales; si no, mezcla k-vías con heapq.merge
+    aprovechando que cada tabla ya está ordenada.
+    """
+    tablas = [t for t in tablas if len(t)]
+    if not tablas:
+        return TablaFrecuencias(b"", np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.uint32))
+    if len(tablas) == 1:
+        return tablas[0]
+    ancho = max(int(t._longitudes().max()) for t in tablas)
+    if ancho <= _ANCHO_MAX_VECTORIZADO:
+        palabras = np.concatenate([t._ancho_fijo(ancho) for t in tablas])
+        conteos = np.concatenate([t.conteos.astype(np.uint64) for t in tablas])
+        orden = np.argsort(palabras, kind="stable")
+        palabras = palabras[orden]
+        inicios = np.flatnonzero(np.concatenate([[True], palabras[1:] != palabras[:-1]]))
+        return _desde_ancho_fijo(palabras[inicios], np.add.reduceat(conteos[orden], inicios))
+    flujos = [t._pares_bytes() for t in tablas]
+    return TablaFrecuencias._desde_ordenados(
+        (w, sum(c for _, c in grupo)) for w, grupo in groupby(heapq.merge(*flujos), key=itemgetter(0))
+    )
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Matriz documento-término dispersa (scipy.sparse CSR) y ponderación TF-IDF.
+
+- matriz_documentos_terminos: de los Counters de count_frequencies (uno por
+  documento) a una matriz CSR de conteos con un Vocabulario compartido
+- matriz_desde_corpus: lo mismo leyendo un directorio o glob de archivos
+- tfidf: ponderación TF-IDF vectorizada sobre toda la matriz
+- guardar_npz / cargar_npz: persistencia en .npz (el archivo también se puede
+  abrir con scipy.sparse.load_npz; el vocabulario va en arrays aparte)
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, List, Mapping, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from paralelo import map_acotado
+from vocabulario import Vocabulario, bloque_utf8, cadenas_utf8, guardar_arrays
+
+
+def matriz_documentos_terminos(
+    conteos: Iterable[Mapping[str, int]],
+    vocabulario: Vocabulario | None = None,
+) -> Tuple[sparse.csr_matrix, Vocabulario]:
+    """
+    Construye la matriz CSR de conteos (filas = documentos, columnas = ids
+    del vocabulario). Los conteos se consumen de uno en uno, así que pueden
+    venir de un generador.
+    """
+    vocabulario = Vocabulario() if vocabulario is None else vocabulario
+    indices: List[np.ndarray] = []
+    datos: List[np.ndarray] = []
+    indptr = [0]
+    for freqs in conteos:
+        items = list(freqs.items())
+        ids = vocabulario.codificar(w for w, _ in items)
+        valores = np.fromiter((c for _, c in items), dtype=np.int64, count=len(items))
+        orden = np.argsort(ids, kind="stable")
+        indices.append(ids[orden].astype(np.int32))
+        datos.append(valores[orden])
+        indptr.append(indptr[-1] + len(items))
+    matriz = sparse.csr_matrix(
+        (
+            np.concatenate(datos) if datos else np.empty(0, dtype=np.int64),
+            np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(indptr) - 1, len(vocabulario)),
+    )
+    return matriz, vocabulario
+
+
+def matriz_desde_corpus(
+    source: str,
+    remove_stopwords: bool = False,
+    backend: str = "punkt",
+    max_workers: int = 4,
+) -> Tuple[sparse.csr_matrix, Vocabulario, List[str]]:
+    """
+    Tokeniza cada archivo de `source` (directorio o glob) con count_file y
+    devuelve (matriz de conteos, vocabulario, rutas en el orden de las filas).
+    """
+    from ejercicio2 import count_file, ensure_nltk_data, iter_corpus_files
+
+    ensure_nltk_data()
+    rutas = list(iter_corpus_files(source))
+    contar = partial(count_file, remove_stopwords=remove_stopwords, backend=backend)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        matriz, vocabulario = matriz_documentos_terminos(map_acotado(executor, contar, rutas, 2 * max_workers))
+    return matriz, vocabulario, rutas
+
+
+def _filas(matriz: sparse.csr_matrix) -> np.ndarray:
+    """Índice de fila de cada elemento no nulo de una CSR."""
+    return np.repeat(np.arange(matriz.shape[0]), np.diff(matriz.indptr))
+
+
+def tfidf(
+    matriz: sparse.csr_matrix,
+    norma: str | None = "l2",
+    idf_suave: bool = True,
+    tf_sublineal: bool = False,
+) -> sparse.csr_matrix:
+    """
+    Pondera una matriz de conteos con TF-IDF, sin bucles por documento.
+
+    - idf = ln((1 + n) / (1 + df)) + 1 con idf_suave; si no, ln(n / df) + 1
+    - tf_sublineal: tf = 1 + ln(tf)
+    - norma: 'l2', 'l1' o None (normalización por fila)
+    """
+    matriz = sparse.csr_matrix(matriz, dtype=np.float64, copy=True)
+    matriz.eliminate_zeros()
+    n_docs, n_terminos = matriz.shape
+    df = np.bincount(matriz.indices, minlength=n_terminos).astype(np.float64)
+    if idf_suave:
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    else:
+        with np.errstate(divide="ignore"):
+            idf = np.log(n_docs / df) + 1.0
+    if tf_sublineal:
+        np.log(matriz.data, out=matriz.data)
+        matriz.data += 1.0
+    matriz.data *= idf[matriz.indices]
+    if norma:
+        filas = _filas(matriz)
+        if norma == "l2":
+            normas = np.sqrt(np.bincount(filas, weights=matriz.data ** 2, minlength=n_docs))
+        elif norma == "l1":
+            normas = np.bincount(filas, weights=np.abs(matriz.data), minlength=n_docs)
+        else:
+            raise ValueError(f"norma desconocida: {norma!r} (opciones: 'l2', 'l1', None)")
+        normas[normas == 0] = 1.0
+        matriz.data /= normas[filas]
+    return matriz
+
+
+def guardar_npz(ruta: str, matriz: sparse.csr_matrix, vocabulario: Vocabulario, comprimido: bool = True) -> None:
+    """
+    Guarda matriz y vocabulario en un solo .npz, exactamente en `ruta` (sin
+    añadirle la extensión). Las palabras se guardan como un bloque UTF-8 más
+    offsets (sin pickle ni arrays de ancho fijo).
+    """
+    matriz = sparse.csr_matrix(matriz)
+    bloque, offsets = bloque_utf8(vocabulario.palabras)
+    guardar_arrays(
+        ruta,
+        comprimido,
+        # Mismas claves que scipy.sparse.save_npz
+        format=np.array(matriz.format.encode("ascii")),
+        shape=np.array(matriz.shape),
+        data=matriz.data,
+        indices=matriz.indices,
+        indptr=matriz.indptr,
+        vocabulario_utf8=bloque,
+        vocabulario_offsets=offsets,
+    )
+
+
+def cargar_npz(ruta: str) -> Tuple[sparse.csr_matrix, Vocabulario]:
+    """Carga lo guardado con guardar_npz."""
+    with np.load(ruta, allow_pickle=False) as f:
+        matriz = sparse.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+        palabras = cadenas_utf8(f["vocabulario_utf8"], f["vocabulario_offsets"])
+    return matriz, Vocabulario(palabras)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Internado de tokens: cada palabra distinta recibe un id entero y los flujos
+de tokens se guardan como arrays uint32 de ids más un Vocabulario compartido.
+
+Un token ocupa 4 bytes en lugar de un objeto str por posición, y las
+frecuencias salen de np.bincount o np.unique sin volver a hashear cadenas. ConteoIds
+imita la API de lectura de Counter (most_common, values, items, []), así que
+top_n_words y compute_stats lo aceptan sin decodificar a cadenas.
+
+bloque_utf8, cadenas_utf8 y guardar_arrays serializan listas de cadenas como
+un bloque de bytes UTF-8 más offsets, en un .npz sin pickle; los usan
+tfidf, tabla_frecuencias y concordancia.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+
+def bloque_utf8(cadenas: Iterable[Union[str, bytes]]) -> Tuple[bytes, np.ndarray]:
+    """
+    Concatena las cadenas (str en UTF-8; bytes tal cual) en un solo bloque.
+    Devuelve (bloque, offsets): la cadena i es bloque[offsets[i]:offsets[i + 1]].
+    """
+    codificadas = [c.encode("utf-8") if isinstance(c, str) else c for c in cadenas]
+    offsets = np.zeros(len(codificadas) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in codificadas], out=offsets[1:])
+    return b"".join(codificadas), offsets
+
+
+def cadenas_utf8(bloque: Union[bytes, np.ndarray], offsets: np.ndarray) -> List[str]:
+    """Inversa de bloque_utf8 (el bloque puede venir como array uint8 de un .npz)."""
+    if isinstance(bloque, np.ndarray):
+        bloque = bloque.tobytes()
+    return [bloque[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def guardar_arrays(ruta: str, comprimido: bool = False, **arrays) -> None:
+    """
+    Guarda los arrays en formato .npz exactamente en `ruta` (np.savez le
+    añadiría .npz si no lo lleva). Los bloques de bytes se guardan como
+    arrays uint8. Se leen con np.load(ruta, allow_pickle=False).
+    """
+    arrays = {k: np.frombuffer(v, dtype=np.uint8) if isinstance(v, bytes) else v for k, v in arrays.items()}
+    guardar = np.savez_compressed if comprimido else np.savez
+    with open(ruta, "wb") as f:
+        guardar(f, **arrays)
+
+
+class Vocabulario:
+    """Biyección palabra <-> id (0, 1, 2, ... en orden de aparición)."""
+
+    def __init__(self, palabras: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self.palabras: List[str] = []
+        self.codificar(palabras)
+
+    def codificar(self, tokens: Iterable[str]) -> np.ndarray:
+        """Devuelve los ids (uint32) de los tokens, añadiendo las palabras nuevas."""
+        tokens = tokens if isinstance(tokens, list) else list(tokens)
+        ids = self._ids
+        # En Python solo se recorren las palabras distintas (en orden de
+        # aparición); los tokens se traducen con map sobre el dict, en C
+        for t in dict.fromkeys(tokens):
+            if t not in ids:
+                ids[t] = len(ids)
+                self.palabras.append(t)
+        codigos = array("I", map(ids.__getitem__, tokens))
+        return np.frombuffer(codigos, dtype=np.uintc).astype(np.uint32, copy=False)
+
+    def id(self, palabra: str) -> int:
+        """Id de la palabra, o -1 si no está en el vocabulario."""
+        return self._ids.get(palabra, -1)
+
+    def decodificar(self, ids: Iterable[int]) -> List[str]:
+        """Convierte ids en palabras."""
+        palabras = self.palabras
+        return [palabras[i] for i in ids]
+
+    def __contains__(self, palabra: str) -> bool:
+        return palabra in self._ids
+
+    def __len__(self) -> int:
+        return len(self.palabras)
+
+
+class TokensCodificados:
+    """Flujo de tokens como array uint32 de ids sobre un Vocabulario."""
+
+    def __init__(self, ids: np.ndarray, vocabulario: Vocabulario):
+        self.ids = ids
+        self.vocabulario = vocabulario
+
+    def frecuencias(self) -> "ConteoIds":
+        """Frecuencia de cada id (ver ConteoIds.desde_ids)."""
+        return ConteoIds.desde_ids(self.ids, self.vocabulario)
+
+    def decodificar(self) -> List[str]:
+        return self.vocabulario.decodificar(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[str]:
+        palabras = self.vocabulario.palabras
+        return (palabras[i] for i in self.ids)
+
+
+class ConteoIds:
+    """
+    Frecuencias por id en forma dispersa: valores[k] es la frecuencia de
+    vocabulario.palabras[ids[k]], con ids crecientes y solo los presentes.
+    Así el coste de consultarlo no depende del tamaño del vocabulario, que
+    puede ser compartido por muchos documentos pequeños.
+    """
+
+    def __init__(self, ids: np.ndarray, valores: np.ndarray, vocabulario: Vocabulario):
+        self.ids = ids
+        self.valores = valores
+        self.vocabulario = vocabulario
+
+    @classmethod
+    def desde_ids(cls, ids: np.ndarray, vocabulario: Vocabulario) -> "ConteoIds":
+        """
+        Cuenta un flujo de ids: con np.bincount si es largo comparado con el
+        vocabulario, y si no con np.unique (coste según el flujo, no según V).
+        """
+        if len(ids) * 8 >= len(vocabulario):
+            conteos = np.bincount(ids, minlength=len(vocabulario))
+            presentes = np.flatnonzero(conteos)
+            return cls(presentes, conteos[presentes], vocabulario)
+        presentes, valores = np.unique(ids, return_counts=True)
+        return cls(presentes, valores, vocabulario)
+
+    def most_common(self, n: int | None = None) -> List[Tuple[str, int]]:
+        """Las n palabras más frecuentes; selecciona con argpartition y ordena solo esas."""
+        valores = self.valores
+        if n is None or n >= len(valores):
+            n = len(valores)
+        if n <= 0:
+            return []
+        # Valor del n-ésimo mayor conteo; los empatados en ese valor se
+        # desempatan por orden de aparición (id menor primero), como Counter
+        umbral = valores[np.argpartition(valores, -n)[-n]]
+        mayores = np.flatnonzero(valores > umbral)
+        empatados = np.flatnonzero(valores == umbral)[: n - len(mayores)]
+        idx = np.concatenate([mayores, empatados])
+        idx = idx[np.lexsort((idx, -valores[idx]))]
+        palabras = self.vocabulario.palabras
+        return [(palabras[self.ids[k]], int(valores[k])) for k in idx]
+
+    def values(self) -> np.ndarray:
+        """Conteos de las palabras presentes (> 0)."""
+        return self.valores
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        palabras = self.vocabulario.palabras
+        return ((palabras[i], int(c)) for i, c in zip(self.ids, self.valores))
+
+    def keys(self) -> Iterator[str]:
+        return (w for w, _ in self.items())
+
+    def total(self) -> int:
+        return int(self.valores.sum())
+
+    def __getitem__(self, palabra: str) -> int:
+        i = self.vocabulario.id(palabra)
+        k = int(np.searchsorted(self.ids, i))
+        return int(self.valores[k]) if i >= 0 and k < len(self.ids) and self.ids[k] == i else 0
+
+    def __len__(self) -> int:
+        return len(self.ids)